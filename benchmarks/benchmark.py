@@ -0,0 +1,167 @@
+from server import FixtureServer
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import multiprocessing
+import argparse
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webscraping_projects'))
+
+scrapers: dict = {
+    'books_scraping': ('books_scraping', 'BooksScraping', 'books'),
+    'films_scraping': ('films_scraping', 'FilmsScraping', 'imdb'),
+    'agricultural_products_scraping': ('products_scraping', 'AgriculturalProductsScraping', 'agrolink')
+}
+
+modes: tuple = ('sequential', 'async', 'process')
+
+def peak_rss() -> float | None:
+
+    """
+        Function that returns the peak resident memory of the process, in MB, or None where it is not available.
+    """
+
+    try:
+        import resource
+
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+async def run_scraper(name: str, mode: str, url: str, concurrency: int, parse_workers: int, report_format: str, options: dict, directory: str, http2: bool = False) -> dict:
+
+    """
+        Function that runs a scraper against the fixture server and returns its metrics summary.
+
+        The "options" are the extra arguments of the scraper, such as "details" for the books.
+    """
+
+    from contextlib import AsyncExitStack
+    from http_client import HttpClient
+    from pipeline import ParsePool
+    from sinks import open_sink
+    from metrics import Metrics
+    import importlib
+
+    module, class_name, _ = scrapers[name]
+    scraper_class = getattr(importlib.import_module(module), class_name)
+
+    metrics = Metrics(f'{name}_{mode}')
+    async with AsyncExitStack() as stack:
+        sink = stack.enter_context(open_sink(os.path.join(directory, name), report_format))
+        parse_pool = await stack.enter_async_context(ParsePool(parse_workers)) if mode == 'process' else None
+        client = await stack.enter_async_context(
+            HttpClient(
+                concurrency=1 if mode == 'sequential' else concurrency,
+                concurrency_per_host=1 if mode == 'sequential' else concurrency,
+                rate_limit=None,
+                parse_pool=parse_pool,
+                metrics=metrics,
+                http2=http2
+            )
+        )
+
+        bot = scraper_class(sink=sink, **options)
+        bot.URL = url
+        await bot.start(client)
+
+    metrics.record_sink(name, sink.rows, sink.write_time)
+    metrics.finish()
+    return metrics.summary()
+
+def run_case(name: str, mode: str, url: str, concurrency: int, parse_workers: int, report_format: str, options: dict, http2: bool, results: multiprocessing.Queue) -> None:
+
+    """
+        Function that runs one benchmark case in its own process, so the peak memory is measured per case.
+    """
+
+    try:
+        with TemporaryDirectory() as directory:
+            started_at = perf_counter()
+            summary = asyncio.run(run_scraper(name, mode, url, concurrency, parse_workers, report_format, options, directory, http2))
+            duration = perf_counter() - started_at
+
+    except Exception as e:
+        results.put({'scraper': name, 'mode': mode, 'error': str(e)})
+        return
+
+    requests = sum(host['requests'] for host in summary['hosts'].values())
+    results.put(
+        {
+            'scraper': name,
+            'mode': mode,
+            'seconds': duration,
+            'pages': requests,
+            'pages_per_second': requests / duration,
+            'rows': summary['rows'],
+            'rows_per_second': summary['rows'] / duration,
+            'retries': sum(host['retries'] for host in summary['hosts'].values()),
+            'bytes': sum(host['bytes'] for host in summary['hosts'].values()),
+            'compressed_bytes': sum(host['compressed_bytes'] for host in summary['hosts'].values()),
+            'connections_new': sum(host['connections_new'] for host in summary['hosts'].values()),
+            'connections_reused': sum(host['connections_reused'] for host in summary['hosts'].values()),
+            'peak_rss_mb': peak_rss(),
+            'latency_p50_ms': max((host['latency_p50_seconds'] for host in summary['hosts'].values()), default=0.0) * 1000,
+            'latency_p99_ms': max((host['latency_p99_seconds'] for host in summary['hosts'].values()), default=0.0) * 1000
+        }
+    )
+
+def main() -> None:
+
+    """
+        Function that serves the fixtures and runs every scraper in every mode against them.
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmarks the scrapers against a local server of recorded fixtures.')
+    parser.add_argument('--scrapers', nargs='+', choices=list(scrapers), default=list(scrapers))
+    parser.add_argument('--modes', nargs='+', choices=modes, default=list(modes))
+    parser.add_argument('--latency', type=float, default=0.05, help='The latency, in seconds, injected in every response.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='The fraction of the requests answered with a 503 error.')
+    parser.add_argument('--products', type=int, default=None, help='The number of products of the agrolink list.')
+    parser.add_argument('--concurrency', type=int, default=20, help='The number of connections of the async and process modes.')
+    parser.add_argument('--parse-workers', type=int, default=os.cpu_count(), help='The number of worker processes of the process mode.')
+    parser.add_argument('--report-format', default='jsonl', help='The format of the sink the rows are written to.')
+    parser.add_argument('--book-details', action='store_true', help='Collects the page of every book in the books scraper.')
+    parser.add_argument('--compress', action='store_true', help='Sends the bodies compressed, with zstd, br or gzip, the first the client accepts.')
+    parser.add_argument('--http2', action='store_true', help='Sends the requests with the HTTP/2 transport, which needs httpx and h2.')
+    parser.add_argument('--output', help='The path of a JSON file to save the results to.')
+    arguments = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with FixtureServer(latency=arguments.latency, error_rate=arguments.error_rate, products=arguments.products, compress=arguments.compress) as server:
+        for name in arguments.scrapers:
+            options = {'details': True} if name == 'books_scraping' and arguments.book_details else {}
+            for mode in arguments.modes:
+                queue = context.Queue()
+                process = context.Process(
+                    target=run_case,
+                    args=(name, mode, server.url(scrapers[name][2]), arguments.concurrency, arguments.parse_workers, arguments.report_format, options, arguments.http2, queue)
+                )
+                process.start()
+                result = queue.get()
+                process.join()
+
+                results.append(result)
+                if 'error' in result:
+                    print(f'{result["scraper"]:<32} {result["mode"]:<10} failed. Error: {result["error"]}.')
+                    continue
+
+                print(
+                    f'{result["scraper"]:<32} {result["mode"]:<10} {result["seconds"]:>8.2f} s {result["pages_per_second"]:>9.1f} pages/s '
+                    f'{result["rows_per_second"]:>10.1f} rows/s {result["latency_p50_ms"]:>8.1f} ms p50 {result["latency_p99_ms"]:>8.1f} ms p99 '
+                    f'{result["peak_rss_mb"] or 0:>8.1f} MB peak {result["compressed_bytes"] / 1e6:>8.2f}/{result["bytes"] / 1e6:.2f} MB compressed/decompressed '
+                    f'{result["connections_new"]:>4} new {result["connections_reused"]:>6} reused connections'
+                )
+
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+
+if __name__ == '__main__':
+    main()
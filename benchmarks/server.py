@@ -0,0 +1,228 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+from time import sleep
+import argparse
+import random
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+encoders: dict = {'gzip': lambda body: gzip.compress(body, 6)}
+if brotli is not None:
+    encoders['br'] = lambda body: brotli.compress(body, quality=5)
+if zstandard is not None:
+    encoders['zstd'] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+
+fixtures_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+class FixtureServer:
+
+    """
+        Class that serves the recorded fixtures as a local stand-in for the scraped websites.
+
+        Every site is served under its own path prefix, so the scrapers only need their "URL" pointed to it:
+
+            /books     books.toscrape, any category and page is served with the recorded category page,
+                       any book with the recorded book page and any cover with the recorded cover.
+            /imdb      the IMDb top chart.
+            /agrolink  the agrolink product list, optionally replicated to "products" products.
+
+        With "compress", the bodies are sent compressed to the clients that accept it, with the first encoding
+        they ask for among gzip, and br and zstd when the optional "brotli" and "zstandard" packages are installed.
+
+        Attributes
+        ----------
+        host: str
+            The host the server listens on.
+
+        port: int
+            The port the server listens on, 0 to pick a free one.
+
+        latency: float
+            The latency, in seconds, injected in every response.
+
+        error_rate: float
+            The fraction of the requests answered with a 503 error.
+
+        products: int | None
+            The number of products of the agrolink list, or None to serve the recorded ones.
+
+        compress: bool
+            Whether the bodies are sent compressed to the clients that accept it.
+
+        fixtures: dict
+            A dict that stores the content of every fixture.
+
+        server: ThreadingHTTPServer
+            The HTTP server, started by "with".
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        url()
+            Function that returns the base URL of a site.
+
+        route()
+            Function that returns the status, the content type and the body of a path.
+    """
+
+    def __init__(
+        self: object,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        products: int | None = None,
+        compress: bool = False
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.host: str = host
+        self.port: int = port
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.products: int | None = products
+        self.compress: bool = compress
+
+        self.fixtures: dict = {}
+        for name in os.listdir(fixtures_directory):
+            with open(os.path.join(fixtures_directory, name), 'rb') as file:
+                self.fixtures[name] = file.read()
+
+        if products:
+            response = json.loads(self.fixtures['agrolink_products.json'])
+            recorded = response['ViewModel']['produtos']
+            response['ViewModel']['produtos'] = [
+                {**recorded[index % len(recorded)], 'IdProduto': index + 1}
+                for index in range(products)
+            ]
+            self.fixtures['agrolink_products.json'] = json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+        self.server: ThreadingHTTPServer | None = None
+
+    def __enter__(self: object) -> object:
+
+        fixture_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def handle_request(self: object) -> None:
+
+                if fixture_server.latency:
+                    sleep(fixture_server.latency)
+
+                if random.random() < fixture_server.error_rate:
+                    status, content_type, body = 503, 'text/plain', b'Service Unavailable'
+                else:
+                    status, content_type, body = fixture_server.route(self.path.split('?', 1)[0])
+
+                accepted = [encoding.split(';')[0].strip() for encoding in (self.headers.get('Accept-Encoding') or '').split(',')]
+                encoding = next((encoding for encoding in accepted if encoding in encoders), None) if fixture_server.compress and status == 200 else None
+                if encoding is not None:
+                    body = encoders[encoding](body)
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                if encoding is not None:
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self: object) -> None:
+
+                self.handle_request()
+
+            def do_POST(self: object) -> None:
+
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self.handle_request()
+
+            def log_message(self: object, *args) -> None:
+
+                pass
+
+        class Server(ThreadingHTTPServer):
+
+            request_queue_size = 1024
+
+        self.server = Server((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self: object, site: str) -> str:
+
+        """
+            Function that returns the base URL of a site.
+        """
+
+        return f'http://{self.host}:{self.port}/{site}'
+
+    def route(self: object, path: str) -> tuple:
+
+        """
+            Function that returns the status, the content type and the body of a path.
+        """
+
+        if path == '/books/index.html':
+            return 200, 'text/html; charset=utf-8', self.fixtures['books_index.html']
+
+        if path.startswith('/books/catalogue/category/books/'):
+            return 200, 'text/html; charset=utf-8', self.fixtures['books_category.html']
+
+        if path.startswith('/books/media/'):
+            return 200, 'image/jpeg', self.fixtures['books_cover.jpg']
+
+        if path.startswith('/books/catalogue/'):
+            return 200, 'text/html; charset=utf-8', self.fixtures['books_product.html']
+
+        if path == '/imdb/chart/top':
+            return 200, 'text/html; charset=utf-8', self.fixtures['imdb_chart.html']
+
+        if path == '/agrolink/agrolinkfito/ListaProdutosBusca':
+            return 200, 'application/json; charset=utf-8', self.fixtures['agrolink_products.json']
+
+        return 404, 'text/plain', b'Not Found'
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serves the recorded fixtures as a local stand-in for the scraped websites.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='The latency, in seconds, injected in every response.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='The fraction of the requests answered with a 503 error.')
+    parser.add_argument('--products', type=int, default=None, help='The number of products of the agrolink list.')
+    parser.add_argument('--compress', action='store_true', help='Sends the bodies compressed to the clients that accept it.')
+    arguments = parser.parse_args()
+
+    with FixtureServer(port=arguments.port, latency=arguments.latency, error_rate=arguments.error_rate, products=arguments.products, compress=arguments.compress) as server:
+        print(f'Serving the fixtures at http://{server.host}:{server.port}. Press Ctrl+C to stop.')
+        try:
+            while True:
+                sleep(3600)
+
+        except KeyboardInterrupt:
+            pass
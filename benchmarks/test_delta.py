@@ -0,0 +1,68 @@
+"""
+    Tests that the delta sink only publishes the delta and replaces the index of the runs that succeed.
+"""
+
+import sqlite3
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webscraping_projects'))
+
+from delta import DeltaSink
+
+def run(path: str, rows: list, finished: bool = True) -> DeltaSink:
+
+    """
+        Function that writes the rows of a run to a delta sink, finishing it only when the run succeeds.
+    """
+
+    sink = DeltaSink(path, ('key',), 'jsonl', path + '_snapshot')
+    sink.write_many(rows)
+    if finished:
+        sink.finish()
+    sink.close()
+
+    return sink
+
+def index(path: str) -> list:
+
+    """
+        Function that returns the rows of the index of a delta sink.
+    """
+
+    with sqlite3.connect(path + '_index.sqlite') as connection:
+        return connection.execute('SELECT key, hash FROM rows ORDER BY key').fetchall()
+
+def read(path: str) -> bytes:
+
+    """
+        Function that reads a file.
+    """
+
+    with open(path, 'rb') as file:
+        return file.read()
+
+def test_failed_run_leaves_delta_and_index(tmp_path: object) -> None:
+
+    """
+        Function that checks that a failed run leaves the visible delta, the snapshot and the index of the last
+        successful run as they were, and that the next run counts its changes against that one.
+    """
+
+    path = str(tmp_path / 'scraper')
+
+    first = run(path, [{'key': 1, 'value': 'a'}, {'key': 2, 'value': 'b'}])
+    assert first.changes == {'inserted': 2, 'updated': 0, 'deleted': 0}
+    assert first.path == path + '_snapshot.jsonl'
+
+    delta, snapshot, entries = read(path + '_delta.jsonl'), read(path + '_snapshot.jsonl'), index(path)
+
+    failed = run(path, [{'key': 1, 'value': 'changed'}, {'key': 3, 'value': 'c'}], finished=False)
+    assert os.path.basename(failed.path).startswith('.')
+    assert read(path + '_delta.jsonl') == delta
+    assert read(path + '_snapshot.jsonl') == snapshot
+    assert index(path) == entries
+
+    second = run(path, [{'key': 1, 'value': 'a'}, {'key': 3, 'value': 'c'}])
+    assert second.changes == {'inserted': 1, 'updated': 0, 'deleted': 1}
+    assert sorted(second.delta.read()['change']) == ['deleted', 'inserted']
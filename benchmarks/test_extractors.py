@@ -0,0 +1,135 @@
+"""
+    Tests that the lxml extractors return the same rows as the original BeautifulSoup extraction on the fixtures.
+
+    Run them with "python -m pytest benchmarks", after "pip install -r requirements-dev.txt".
+"""
+
+from server import fixtures_directory
+from bs4 import BeautifulSoup
+import pytest
+import sys
+import re
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webscraping_projects'))
+
+from extractors import extract_categories, extract_pages, extract_books, extract_book_details, extract_films, ratings
+
+def read(name: str) -> bytes:
+
+    """
+        Function that reads a fixture.
+    """
+
+    with open(os.path.join(fixtures_directory, name), 'rb') as file:
+        return file.read()
+
+def reference_extract_categories(content: bytes, url: str) -> list:
+
+    """
+        Function that extracts all available categories with BeautifulSoup, as originally done.
+    """
+
+    response = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    return [
+        {
+            'category': category.text.strip(),
+            'url': (url + '/' + category['href']).replace('/index.html', '').strip(),
+            'pages': 0,
+            'books': []
+        }
+        for category in response.select('div.side_categories ul:nth-child(2) a[href*="catalogue/category/books"]')
+    ]
+
+def reference_extract_pages(content: bytes) -> int:
+
+    """
+        Function that extracts the number of pages of a category with BeautifulSoup, as originally done.
+    """
+
+    response = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    quantity_items = response.select_one('form.form-horizontal strong:nth-child(2)')
+    if not quantity_items or int(quantity_items.text) == 0:
+        return 0
+    elif int(quantity_items.text) % 20 == 0:
+        return int(quantity_items.text) // 20
+    else:
+        return int(quantity_items.text) // 20 + 1
+
+def reference_extract_books(content: bytes, url: str, category: str) -> list:
+
+    """
+        Function that extracts all books from a page with BeautifulSoup, as originally done.
+    """
+
+    response = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    return [
+        {
+            'category': category,
+            'book_title': book.select_one('h3 a')['title'],
+            'book_price': float(re.sub(r'[^\d.]', '', book.select_one('div.product_price p.price_color').text)),
+            'book_image': url + '/media' + book.select_one('div.image_container img')['src'].split('/media')[-1],
+            'book_rating': None,
+            'book_url': url + '/catalogue/' + book.select_one('h3 a')['href'].replace('../', '')
+        }
+        for book in response.select('article.product_pod')
+    ]
+
+def reference_extract_book_details(content: bytes) -> dict:
+
+    """
+        Function that extracts the details from the page of a book with BeautifulSoup.
+    """
+
+    response = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    rating = response.select_one('div.product_main p.star-rating')
+    information = {row.select_one('th').text.strip(): row.select_one('td').text.strip() for row in response.select('table.table-striped tr')}
+    availability = re.search(r'\((\d+) available\)', information.get('Availability', ''))
+    description = response.select_one('#product_description + p')
+
+    return {
+        'book_rating': next((ratings[name] for name in rating['class'] if name in ratings), None) if rating else None,
+        'book_upc': information.get('UPC'),
+        'book_availability': int(availability.group(1)) if availability else 0,
+        'book_description': description.text.strip() if description else None
+    }
+
+def reference_extract_films(content: bytes) -> list:
+
+    """
+        Function that extracts all films from the IMDb top chart with BeautifulSoup, as originally done.
+    """
+
+    response = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    return [
+        {
+            'film_name': film.select_one('h3.ipc-title__text').text.split('.', 1)[-1].strip(),
+            'film_year': film.select_one('div[class*="title-metadata"] > span:nth-child(1)').text.strip(),
+            'film_duration': film.select_one('div[class*="title-metadata"] > span:nth-child(2)').text.strip(),
+            'film_review': re.search(r'([0-9]\.[0-9])', film.select_one('span.ipc-rating-star--rating').text.strip()).group(1)
+        }
+        for film in response.select('li.ipc-metadata-list-summary-item')
+    ]
+
+@pytest.mark.parametrize(
+    'extract, reference_extract, fixture, kwargs',
+    [
+        (extract_categories, reference_extract_categories, 'books_index.html', {'url': 'http://localhost'}),
+        (extract_pages, reference_extract_pages, 'books_category.html', {}),
+        (extract_books, reference_extract_books, 'books_category.html', {'url': 'http://localhost', 'category': 'Travel'}),
+        (extract_book_details, reference_extract_book_details, 'books_product.html', {}),
+        (extract_films, reference_extract_films, 'imdb_chart.html', {})
+    ],
+    ids=['categories', 'pages', 'books', 'book_details', 'films']
+)
+def test_parity(extract: object, reference_extract: object, fixture: str, kwargs: dict) -> None:
+
+    """
+        Function that checks that the lxml extractor returns the same, non-empty, result as the BeautifulSoup one.
+    """
+
+    content = read(fixture)
+
+    expected = reference_extract(content, **kwargs)
+    assert expected
+    assert extract(content, **kwargs) == expected
@@ -0,0 +1,67 @@
+"""
+    Tests that the lease lets only one run of a scraper hold it, and that the lease of a dead run is taken over.
+"""
+
+import subprocess
+import socket
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webscraping_projects'))
+
+from lease import Lease
+
+def test_second_acquire_refused(tmp_path: object) -> None:
+
+    """
+        Function that checks that a lease held by a live run is refused to another one until it is released.
+    """
+
+    path = str(tmp_path / 'scraper.lock')
+    first, second = Lease(path), Lease(path)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert Lease.holder(path)[2] == first.token
+
+    first.release()
+    assert not os.path.exists(path)
+    assert second.acquire()
+    second.release()
+
+def test_dead_process_taken_over(tmp_path: object) -> None:
+
+    """
+        Function that checks that the lease of a process that died without releasing it is taken over at once.
+    """
+
+    path = str(tmp_path / 'scraper.lock')
+
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f'{socket.gethostname()} {process.pid} dead {0}')
+    os.utime(path)
+
+    lease = Lease(path)
+    assert lease.acquire()
+    assert Lease.holder(path)[2] == lease.token
+    lease.release()
+
+def test_release_after_takeover(tmp_path: object) -> None:
+
+    """
+        Function that checks that a run whose lease was taken over does not remove the lease of the new holder.
+    """
+
+    path = str(tmp_path / 'scraper.lock')
+    first, second = Lease(path), Lease(path)
+
+    assert first.acquire()
+    assert second.claim(first.token)
+    assert second.acquire()
+
+    first.release()
+    assert Lease.holder(path)[2] == second.token
+    assert not first.renew()
+    second.release()
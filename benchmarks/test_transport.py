@@ -0,0 +1,95 @@
+"""
+    Tests that the bodies received compressed with every supported encoding are decompressed and counted.
+
+    The brotli and zstd cases are skipped when the optional "brotli" and "zstandard" packages are not installed.
+"""
+
+from server import FixtureServer, fixtures_directory, encoders
+import asyncio
+import pytest
+import zlib
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webscraping_projects'))
+
+from transport import Decompressor, DecompressedStream, Http2Session
+
+with open(os.path.join(fixtures_directory, 'books_category.html'), 'rb') as file:
+    body = file.read()
+
+def deflate(content: bytes) -> bytes:
+
+    """
+        Function that compresses a body with zlib, as sent with the "deflate" encoding.
+    """
+
+    return zlib.compress(content)
+
+class ChunkedStream:
+
+    """
+        Class that reads a body in chunks of up to "n" bytes, like the body stream of aiohttp.
+    """
+
+    def __init__(self: object, content: bytes) -> None:
+
+        self.content: bytes = content
+
+    async def read(self: object, n: int = -1) -> bytes:
+
+        n = len(self.content) if n < 0 else n
+        chunk, self.content = self.content[:n], self.content[n:]
+        return chunk
+
+@pytest.mark.parametrize('encoding', ['gzip', 'deflate', 'br', 'zstd'])
+def test_decompressed_stream(encoding: str) -> None:
+
+    """
+        Function that checks that a compressed body read in chunks is decompressed whole, and its sizes counted.
+    """
+
+    if encoding not in encoders and encoding != 'deflate':
+        pytest.skip(f'The {encoding} encoding needs its optional package.')
+
+    compressed = (encoders.get(encoding) or deflate)(body)
+    stream = DecompressedStream(ChunkedStream(compressed), Decompressor(encoding))
+
+    async def read() -> bytes:
+
+        return b''.join([chunk async for chunk in stream.iter_chunked(1024)])
+
+    assert asyncio.run(read()) == body
+    assert stream.decompressor.compressed == len(compressed)
+    assert stream.total_bytes == len(body)
+
+def test_http2_session() -> None:
+
+    """
+        Function that checks that the httpx transport receives a compressed body as it was sent, and traces its connections.
+    """
+
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+
+    connections = []
+
+    async def fetch(url: str) -> list:
+
+        session = Http2Session(2, 10, {'Accept-Encoding': 'gzip'}, lambda host, reused: connections.append(reused))
+        try:
+            responses = []
+            for _ in range(2):
+                async with session.request('GET', url) as response:
+                    responses.append((response.status, response.headers.get('Content-Encoding'), await response.read()))
+            return responses
+
+        finally:
+            await session.close()
+
+    with FixtureServer(compress=True) as server:
+        responses = asyncio.run(fetch(server.url('books') + '/catalogue/category/books/travel_2/index.html'))
+
+    assert [(status, encoding) for status, encoding, _ in responses] == [(200, 'gzip'), (200, 'gzip')]
+    assert zlib.decompress(responses[0][2], 16 + zlib.MAX_WBITS) == body
+    assert connections == [False, True]
@@ -1 +0,0 @@
-"python.exe" "C:\Users\duzin\Documents\GitHub\Webscraping_projects\start_all.py"
\ No newline at end of file
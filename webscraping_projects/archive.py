@@ -0,0 +1,472 @@
+"""
+    Classes that archive the raw responses of the runs and read them back to replay the runs offline.
+
+    Every run appends its responses to its own archive file, "<YYYYmmdd_HHMMSS>_<pid>.gz", named after the time
+    the run started and the process that archived them, in which each response is a gzip member of its own,
+    like the ".warc.gz" files: a line with its metadata as JSON, such as the URL, the status, the headers and
+    the time, followed by its body. The whole file is a valid gzip file, and an
+    index next to it, "<YYYYmmdd_HHMMSS>_<pid>.index.jsonl", gives the offset and length of every member, so a
+    response is read back without decompressing the others.
+"""
+
+from urllib.parse import urlencode
+from datetime import datetime
+from time import time
+import mmap
+import json
+import zlib
+import os
+
+def archive_key(method: str, url: str, params: dict | None = None, data: dict | None = None) -> str:
+
+    """
+        Function that returns the key of a request in the archive, from its method, URL, query and form.
+    """
+
+    key = f'{method} {url}'
+    if params:
+        key += '?' + urlencode(params)
+    if data:
+        key += ' ' + urlencode(data)
+
+    return key
+
+class ArchiveRecord:
+
+    """
+        Class that compresses a response while its body is received, to be appended to the archive when done.
+
+        Attributes
+        ----------
+        key: str
+            The key of the request of the response.
+
+        compressor: object
+            The gzip compressor of the record.
+
+        chunks: list
+            A list that stores the compressed chunks of the record.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        write()
+            Function that compresses a chunk of the body.
+
+        finish()
+            Function that returns the compressed record.
+    """
+
+    def __init__(
+        self: object,
+        key: str,
+        url: str,
+        status: int,
+        headers: dict
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.key: str = key
+
+        self.compressor: object = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self.chunks: list = [
+            self.compressor.compress(
+                json.dumps(
+                    {'key': key, 'url': url, 'status': status, 'headers': dict(headers), 'archived_at': time()},
+                    ensure_ascii=False
+                ).encode('utf-8') + b'\n'
+            )
+        ]
+
+    def write(self: object, chunk: bytes) -> None:
+
+        """
+            Function that compresses a chunk of the body.
+        """
+
+        self.chunks.append(self.compressor.compress(chunk))
+
+    def finish(self: object) -> bytes:
+
+        """
+            Function that returns the compressed record.
+        """
+
+        self.chunks.append(self.compressor.flush())
+        return b''.join(self.chunks)
+
+class ArchivedStream:
+
+    """
+        Class that passes the body stream of a response to its decoder, writing what is read to its record.
+
+        Attributes
+        ----------
+        stream: object
+            The body stream of the response.
+
+        record: ArchiveRecord
+            The record the body is written to.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        read()
+            Function that reads up to "n" bytes of the body, or all of it.
+
+        iter_chunked()
+            Function that yields the body in chunks of up to "n" bytes.
+    """
+
+    def __init__(
+        self: object,
+        stream: object,
+        record: ArchiveRecord
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.stream: object = stream
+        self.record: ArchiveRecord = record
+
+    async def read(self: object, n: int = -1) -> bytes:
+
+        """
+            Function that reads up to "n" bytes of the body, or all of it.
+        """
+
+        chunk = await self.stream.read(n)
+        self.record.write(chunk)
+        return chunk
+
+    async def iter_chunked(self: object, n: int) -> object:
+
+        """
+            Function that yields the body in chunks of up to "n" bytes.
+        """
+
+        async for chunk in self.stream.iter_chunked(n):
+            self.record.write(chunk)
+            yield chunk
+
+class ReplayedStream:
+
+    """
+        Class that serves an archived body to a decoder, like the body stream of a response.
+
+        Attributes
+        ----------
+        content: bytes
+            The archived body.
+
+        position: int
+            The number of bytes already read.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        read()
+            Function that reads up to "n" bytes of the body, or all of it.
+
+        iter_chunked()
+            Function that yields the body in chunks of up to "n" bytes.
+    """
+
+    def __init__(
+        self: object,
+        content: bytes
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.content: bytes = content
+        self.position: int = 0
+
+    @property
+    def total_bytes(self: object) -> int:
+
+        return len(self.content)
+
+    async def read(self: object, n: int = -1) -> bytes:
+
+        """
+            Function that reads up to "n" bytes of the body, or all of it.
+        """
+
+        end = len(self.content) if n < 0 else self.position + n
+        chunk = self.content[self.position:end]
+        self.position += len(chunk)
+        return chunk
+
+    async def iter_chunked(self: object, n: int) -> object:
+
+        """
+            Function that yields the body in chunks of up to "n" bytes.
+        """
+
+        while chunk := await self.read(n):
+            yield chunk
+
+class ResponseArchive:
+
+    """
+        Class that appends the responses of a run to its archive file.
+
+        A record is only appended once its whole body is received, so the records of concurrent requests are
+        never interleaved. Only successful responses with a body are archived. The file is named after the
+        process too, so the workers of a run, started at the same time, never append to the same file.
+
+        Attributes
+        ----------
+        run: str
+            The name of the run, the time it started as "YYYYmmdd_HHMMSS".
+
+        path: str
+            The path of the archive file.
+
+        file: object
+            The archive file, opened to append.
+
+        index: object
+            The index file, opened to append.
+
+        records: int
+            The number of records appended by the run.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        record()
+            Function that starts the record of a response.
+
+        append()
+            Function that appends a finished record to the archive and to its index.
+
+        put()
+            Function that archives a response whose body is already received.
+
+        close()
+            Function that closes the files.
+    """
+
+    def __init__(
+        self: object,
+        directory: str,
+        started_at: datetime | None = None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        self.run: str = (started_at or datetime.now()).strftime('%Y%m%d_%H%M%S')
+        name = f'{self.run}_{os.getpid()}'
+
+        self.path: str = os.path.join(directory, f'{name}.gz')
+        self.file: object = open(self.path, 'ab')
+        self.index: object = open(os.path.join(directory, f'{name}.index.jsonl'), 'a', encoding='utf-8')
+
+        self.records: int = 0
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    @staticmethod
+    def record(key: str, url: str, status: int, headers: dict) -> ArchiveRecord:
+
+        """
+            Function that starts the record of a response.
+        """
+
+        return ArchiveRecord(key, url, status, headers)
+
+    def append(self: object, record: ArchiveRecord) -> None:
+
+        """
+            Function that appends a finished record to the archive and to its index.
+        """
+
+        content = record.finish()
+        offset = self.file.tell()
+        self.file.write(content)
+        self.file.flush()
+
+        self.index.write(json.dumps({'key': record.key, 'offset': offset, 'length': len(content)}, ensure_ascii=False) + '\n')
+        self.index.flush()
+
+        self.records += 1
+
+    def put(self: object, key: str, url: str, status: int, headers: dict, content: bytes) -> None:
+
+        """
+            Function that archives a response whose body is already received.
+        """
+
+        record = self.record(key, url, status, headers)
+        record.write(content)
+        self.append(record)
+
+    def close(self: object) -> None:
+
+        """
+            Function that closes the files.
+        """
+
+        self.file.close()
+        self.index.close()
+
+class ArchiveReader:
+
+    """
+        Class that reads the archived responses back, from every archive file of a directory, or of one run.
+
+        The indexes are read in the order of the runs, so the latest archived response of every request is
+        the one returned. A response that was not modified, and so not archived by its run, is found in
+        the archive of an earlier run. With a "run", only the archive files of that run are read, so a
+        specific crawl is reproduced. The archive files are memory-mapped and only the members read are
+        decompressed.
+
+        Attributes
+        ----------
+        directory: str
+            The directory of the archive files.
+
+        run: str | None
+            The name of the run read, the time it started as "YYYYmmdd_HHMMSS", or None to read every run.
+
+        entries: dict
+            A dict that stores, per key, the archive file, the offset and the length of its latest record.
+
+        maps: dict
+            A dict that stores the memory map of every archive file read.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        __len__()
+            Function that returns the number of requests archived.
+
+        __contains__()
+            Function that returns whether a request was archived.
+
+        get()
+            Function that returns the metadata and the body of the archived response of a request.
+
+        close()
+            Function that closes the memory maps.
+    """
+
+    def __init__(
+        self: object,
+        directory: str,
+        run: str | None = None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.directory: str = directory
+        self.run: str | None = run
+
+        self.entries: dict = {}
+        self.maps: dict = {}
+
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        for name in names:
+            if not name.endswith('.index.jsonl') or (run is not None and not name.startswith(run + '_')):
+                continue
+
+            path = os.path.join(directory, name.removesuffix('.index.jsonl') + '.gz')
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(os.path.join(directory, name), encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+
+                    if entry['offset'] + entry['length'] <= size:
+                        self.entries[entry['key']] = (path, entry['offset'], entry['length'])
+
+        if run is not None and not self.entries:
+            raise Exception(
+                f'The run {run} is not in the archive of "{directory}".'
+            )
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def __len__(self: object) -> int:
+
+        """
+            Function that returns the number of requests archived.
+        """
+
+        return len(self.entries)
+
+    def __contains__(self: object, key: str) -> bool:
+
+        """
+            Function that returns whether a request was archived.
+        """
+
+        return key in self.entries
+
+    def get(self: object, key: str) -> tuple:
+
+        """
+            Function that returns the metadata and the body of the archived response of a request.
+        """
+
+        if key not in self.entries:
+            raise Exception(
+                f'The response of "{key}" is not in the archive of "{self.directory}".'
+            )
+
+        path, offset, length = self.entries[key]
+        if path not in self.maps:
+            with open(path, 'rb') as file:
+                self.maps[path] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        record = zlib.decompress(self.maps[path][offset:offset + length], 31)
+        metadata, content = record.split(b'\n', 1)
+        return json.loads(metadata), content
+
+    def close(self: object) -> None:
+
+        """
+            Function that closes the memory maps.
+        """
+
+        for archive_map in self.maps.values():
+            archive_map.close()
+        self.maps = {}
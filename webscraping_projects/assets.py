@@ -0,0 +1,186 @@
+from urllib.parse import urlsplit
+from http_client import HttpClient
+from time import time
+import hashlib
+import sqlite3
+import asyncio
+import uuid
+import os
+
+async def iterate_chunks(stream: object, size: int = 64 * 1024) -> object:
+
+    """
+        Function that yields the body of a response in chunks while it is received.
+    """
+
+    async for chunk in stream.iter_chunked(size):
+        yield chunk
+
+class AssetStore:
+
+    """
+        Class that downloads the files linked by the rows, such as images, and keeps them on disk addressed
+        by the hash of their content.
+
+        Each file is streamed to disk while it is received and stored as "<hash[:2]>/<hash><extension>",
+        so the same content linked by several URLs is written once. An index, in a SQLite file, maps every
+        URL to its file, so the URLs downloaded by a previous run are skipped while their file is present.
+        Every download is committed at once, so several processes can share the store.
+
+        Attributes
+        ----------
+        directory: str
+            The directory the files are stored in.
+
+        connection: sqlite3.Connection
+            The connection to the SQLite file of the index.
+
+        tasks: dict
+            A dict that stores the download of every URL of the run, so each one is downloaded once.
+
+        counts: dict
+            A dict that stores the number of files downloaded, already present and duplicated, and of the
+            downloads that failed.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        get()
+            Function that returns the path of the file of a URL, or None if it is not present.
+
+        fetch()
+            Function that returns the download of the file of a URL, started once per run.
+
+        download()
+            Function that downloads the file of a URL and returns its path, or None if the download failed.
+
+        close()
+            Function that saves the index and closes the SQLite file.
+    """
+
+    def __init__(
+        self: object,
+        directory: str
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.directory: str = directory
+
+        os.makedirs(directory, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(os.path.join(directory, 'index.sqlite'), timeout=60)
+        self.connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS assets (
+                    url TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    downloaded_at REAL NOT NULL
+                )
+            '''
+        )
+        self.connection.commit()
+
+        self.tasks: dict = {}
+        self.counts: dict = {'downloaded': 0, 'present': 0, 'duplicated': 0, 'failed': 0}
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def get(self: object, url: str) -> str | None:
+
+        """
+            Function that returns the path of the file of a URL, or None if it is not present.
+        """
+
+        entry = self.connection.execute('SELECT path FROM assets WHERE url = ?', (url,)).fetchone()
+        if entry is None or not os.path.exists(os.path.join(self.directory, entry[0])):
+            return None
+
+        return os.path.join(self.directory, entry[0])
+
+    def fetch(self: object, client: HttpClient, url: str) -> asyncio.Future:
+
+        """
+            Function that returns the download of the file of a URL, started once per run.
+        """
+
+        if url not in self.tasks:
+            self.tasks[url] = asyncio.ensure_future(self.download(client, url))
+
+        return self.tasks[url]
+
+    async def download(self: object, client: HttpClient, url: str) -> str | None:
+
+        """
+            Function that downloads the file of a URL and returns its path, or None if the download failed.
+
+            A failed download is not raised, so a missing file does not fail the run, and is tried again by the next one.
+        """
+
+        path = self.get(url)
+        if path is not None:
+            self.counts['present'] += 1
+            return path
+
+        temporary_path = os.path.join(self.directory, f'.{uuid.uuid4().hex}.part')
+        content_hash = hashlib.sha256()
+        size = 0
+        try:
+            with open(temporary_path, 'wb') as file:
+                async for chunk in client.request_items('GET', url, f'the file {url}', iterate_chunks, archived=False):
+                    content_hash.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+
+        except BaseException as e:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+            if not isinstance(e, Exception):
+                raise
+
+            print(f'It was not possible to download the file {url}. Error: {e}.')
+            self.counts['failed'] += 1
+            return None
+
+        digest = content_hash.hexdigest()
+        relative_path = os.path.join(digest[:2], digest + os.path.splitext(urlsplit(url).path)[1].lower())
+        path = os.path.join(self.directory, relative_path)
+
+        if os.path.exists(path):
+            os.remove(temporary_path)
+            self.counts['duplicated'] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temporary_path, path)
+            self.counts['downloaded'] += 1
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?)',
+            (url, relative_path, size, time())
+        )
+        self.connection.commit()
+
+        return path
+
+    def close(self: object) -> None:
+
+        """
+            Function that saves the index and closes the SQLite file.
+        """
+
+        for task in self.tasks.values():
+            task.cancel()
+
+        self.connection.commit()
+        self.connection.close()
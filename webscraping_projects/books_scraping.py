@@ -1,265 +1,184 @@
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-from time import sleep, time
-from colorama import Fore
-import pandas as pd
-import requests
-import aiocron
-import asyncio
+from scheduler import schedule
 import sys
+
+if __name__ == '__main__' and '--once' not in sys.argv:
+    schedule(__file__, '--once', offset=int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    sys.exit()
+
+from framework import Scraper, Page, run_scraper
+from extractors import extract_categories, extract_first_page, extract_books, extract_book_details
+from http_client import HttpClient
+from functools import partial
+import asyncio
 import os
-import re
 
 import warnings
 
 warnings.simplefilter('ignore')
 
-class BooksScraping:
+class BooksScraping(Scraper):
 
     """
         Class that scrapes all the books.
 
+        Every category is a seed: its first page gives the number of pages of the category, whose remaining
+        pages are then collected concurrently. The cover of every book can be downloaded, with DOWNLOAD_ASSETS.
+
         Attributes
         ----------
-        session: requests.Session
-            A request session object used to store cookies and request history.
-
-        URL: str
-            The URL of the website to scrape.
-
         categories: list
             A list that stores all available categories.
 
-        books: list
-            A list that stores all scraped books.
+        details: bool
+            Whether the page of every book is collected to add its rating, UPC, availability and description.
+
+        book_details: dict
+            A dict that stores, per book URL, the task collecting its details, so each book is collected once.
 
         Methods
         -------
         __init__()
             Constructor that initializes the necessary variables.
 
-        start()
-            Function responsible for controlling the scraping process.
+        seeds()
+            Function that collects all available categories and returns the first page of each one.
 
-        get_categories()
-            Function that collects all available categories.
+        paginate()
+            Function that returns the remaining pages of a category from its first page.
 
-        scraping_books()
-            Function that collects all books from all categories.
+        rows()
+            Function that returns the books of a page.
+
+        enrich()
+            Function that adds the details of every book of a page to its row.
+
+        get_book_details()
+            Function that collects the details from the page of a book.
     """
 
-    session: requests.Session = requests.Session()
-    session.headers.update(
-        {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36'
-        }
-    )
+    name: str = 'books_scraping'
+    URL: str = 'https://books.toscrape.com'
+    keys: tuple = ('book_title', 'category')
+    categorical: tuple = ('category',)
+    sheet_name: str = 'books'
+    checkpointed: bool = True
+    asset_columns: tuple = ('book_image',)
 
     def __init__(
-        self: object
+        self: object,
+        *args,
+        details: bool = False,
+        **kwargs
     ) -> None:
 
         """
             Constructor that initializes the necessary variables.
         """
 
-        self.URL: str = 'https://books.toscrape.com'
+        super().__init__(*args, **kwargs)
 
         self.categories: list = []
 
-        self.books: list = []
+        self.details: bool = details
+        self.book_details: dict = {}
+
+    async def seeds(self: object, client: HttpClient) -> list:
+
+        """
+            Function that collects all available categories and returns the first page of each one.
+        """
+
+        self.categories = await self.fetch(
+            client,
+            Page(self.URL + '/index.html', 'all categories', partial(extract_categories, url=self.URL), step='categories')
+        )
+
+        print(f'Collecting books from {len(self.categories)} categories...')
+        return [
+            Page(
+                category['url'] + '/index.html',
+                f'the first page of the category {category["category"]}',
+                partial(extract_first_page, url=self.URL, category=category['category']),
+                step='first_page',
+                context=category
+            )
+            for category in self.categories
+        ]
+
+    def paginate(self: object, page: Page, data: dict) -> list:
 
-    def start(self: object) -> None:
+        """
+            Function that returns the remaining pages of a category from its first page.
+
+            The number of pages is kept in the category, so every category holds its own pagination.
+        """
+
+        category = page.context
+        category['pages'] = data['pages']
+
+        return [
+            Page(
+                category['url'] + f'/page-{number}.html',
+                f'books from the category {category["category"]} and page {number}',
+                partial(extract_books, url=self.URL, category=category['category']),
+                step='books',
+                context=category
+            )
+            for number in range(2, category['pages'] + 1)
+        ]
+
+    def rows(self: object, page: Page, data: object) -> list:
 
         """
-            Function responsible for controlling the scraping process.
+            Function that returns the books of a page.
         """
 
-        self.get_categories()
-        self.scraping_books()
+        return data['books'] if page.step == 'first_page' else data
 
-    def get_categories(self: object) -> None:
+    async def enrich(self: object, client: HttpClient, rows: list) -> list:
 
         """
-            Function that collects all available categories.
+            Function that adds the details of every book of a page to its row.
+
+            The pages of the books are collected concurrently, sharing the connections and the rate limit of the
+            listing pages. A book listed in several categories is collected only once. Its collection is shared by
+            the pages that list it, so it is shielded from the cancellation of any of them, and one that failed is
+            started again by the next page that lists it. Does nothing when "details" is off.
         """
 
-        attempts = 0
-        while True:
-            if attempts == 3:
-                raise Exception(
-                    'After 3 failed attempts, it was not possible to collect all categories.'
-                )
-
-            try:
-                response = self.session.get(
-                    url=self.URL + '/index.html',
-                    timeout=90
-                )
-
-                if response.status_code == 200:
-                    response = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
-                    for category in response.select('div.side_categories ul:nth-child(2) a[href*="catalogue/category/books"]'):
-                        self.categories.append(
-                            {
-                                'category': category.text.strip(),
-                                'url': (self.URL + '/' + category['href']).replace('/index.html', '').strip(),
-                                'books': []
-                            }
-                        )
-                    break
-
-                print(f'Attempt {attempts} to collect all categories failed. Response: {response}. Trying again...')
-                attempts += 1
-                sleep(10)
-
-            except Exception as e:
-                print(f'Attempt {attempts} to collect all categories failed. Error: {e}. Trying again...')
-                attempts += 1
-                sleep(10)
-
-    def scraping_books(self: object) -> None:
+        if not self.details:
+            return rows
+
+        for book in rows:
+            task = self.book_details.get(book['book_url'])
+            if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+                self.book_details[book['book_url']] = asyncio.ensure_future(self.get_book_details(client, book))
+
+        details = await client.gather(*(asyncio.shield(self.book_details[book['book_url']]) for book in rows))
+        return [{**book, **book_details} for book, book_details in zip(rows, details)]
+
+    async def get_book_details(self: object, client: HttpClient, book: dict) -> dict:
 
         """
-            Function that collects all books from all categories.
+            Function that collects the details from the page of a book.
         """
 
-        for index, category in enumerate(self.categories):
-            print(f'Collecting books from the {category["category"]} category. {index + 1} of {len(self.categories)} categories...')
-            attempts = 0
-            while True:
-                if attempts == 3:
-                    raise Exception(
-                        f'After 3 failed attempts, it was not possible to collect the number of pages for this category {category["category"]}.'
-                    )
-
-                try:
-                    response = self.session.get(
-                        url=category['url'] + '/index.html',
-                        timeout=90
-                    )
-
-                    if response.status_code == 200:
-                        response = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
-                        quantity_items = response.select_one('form.form-horizontal strong:nth-child(2)')
-                        if not quantity_items or int(quantity_items.text) == 0:
-                            self.pages = 0
-                        elif int(quantity_items.text) % 20 == 0:
-                            self.pages = int(quantity_items.text) // 20
-                        else:
-                            self.pages = int(quantity_items.text) // 20 + 1
-                        break
-
-                    print(f'Attempt {attempts} to collect the number of pages for this category {category["category"]} failed. Response: {response}. Trying again...')
-                    attempts += 1
-                    sleep(10)
-
-                except Exception as e:
-                    print(f'Attempt {attempts} to collect the number of pages for this category {category["category"]} failed. Error: {e}. Trying again...')
-                    attempts += 1
-                    sleep(10)
-
-            for page in range(1, self.pages + 1):
-                attempts = 0
-                while True:
-                    if attempts == 3:
-                        raise Exception(
-                            f'After 3 failed attempts, it was not possible to collect books from the category {category["category"]} and page {page}.'
-                        )
-
-                    try:
-                        response = self.session.get(
-                            url=category['url'] + '/index.html' if page == 1 else category['url'] + f'/page-{page}.html',
-                            timeout=90
-                        )
-
-                        if response.status_code == 200:
-                            response = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
-                            for book in response.select('article.product_pod'):
-                                self.books.append(
-                                    {
-                                        'category': category['category'],
-                                        'book_title': book.select_one('h3 a')['title'],
-                                        'book_price': float(re.sub(r'[^\d.]', '', book.select_one('div.product_price p.price_color').text)),
-                                        'book_image': self.URL + '/media' + book.select_one('div.image_container img')['src'].split('/media')[-1],
-                                        'book_rating': ''
-                                    }
-                                )
-                            break
-
-                        print(f'Attempt {attempts} to collect books from the category {category["category"]} and page {page} failed. Response: {response}. Trying again...')
-                        attempts += 1
-                        sleep(10)
-
-                    except Exception as e:
-                        print(f'Attempt {attempts} to collect books from the category {category["category"]} and page {page} failed. Error: {e}. Trying again...')
-                        attempts += 1
-                        sleep(10)
-
-additional_minutes = 1 + int(sys.argv[1]) if len(sys.argv) > 1 else 1
-if datetime.now().second >= 50:
-    additional_minutes += 1
-cron = (datetime.now() + timedelta(minutes=additional_minutes)).strftime('%M %H * * *')
-print(f'This script will start at {datetime.strptime(cron, "%M %H * * *").strftime("%H:%M")}.')
-
-@aiocron.crontab(cron, start=True)
-async def start_scraping_books_initial():
-
-    init_time = time()
-
-    try:
-        bot = BooksScraping()
-
-        bot.start()
-
-    except Exception as e:
-        print(f'Fail of the scraping process. Error: {e}.')
-
-    else:
-        print(f'Scraping process successfully completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
-
-    finally:
-        directory_report = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'books_scraping')
-        os.makedirs(directory_report, exist_ok=True)
-
-        print(f'Saving the collected data in an excel report in the {Fore.GREEN}"{directory_report}"{Fore.RESET} directory.')
-        with pd.ExcelWriter(os.path.join(directory_report, 'books_scraping.xlsx')) as writer:
-            dataframe = pd.DataFrame(bot.books)
-            dataframe['created_at'] = datetime.now()
-            dataframe.to_excel(writer, index=False, sheet_name='books')
-
-        start_scraping_books_initial.stop()
-
-@aiocron.crontab('0 8 * * *', start=True)
-async def start_scraping_books_recursively():
-
-    init_time = time()
-
-    try:
-        bot = BooksScraping()
-
-        bot.start()
-
-    except Exception as e:
-        print(f'Fail of the scraping process. Error: {e}.')
-
-    else:
-        print(f'Scraping process successfully completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
-
-    finally:
-        directory_report = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'books_scraping')
-        os.makedirs(directory_report, exist_ok=True)
+        return await self.fetch(
+            client,
+            Page(book['book_url'], f'the details of the book {book["book_title"]}', extract_book_details, step='details')
+        )
+
+book_details = os.environ.get('BOOK_DETAILS', '0') == '1'
+
+async def scrape_books(client: HttpClient | None = None) -> None:
 
-        print(f'Saving the collected data in an excel report in the {Fore.GREEN}"{directory_report}"{Fore.RESET} directory.')
-        with pd.ExcelWriter(os.path.join(directory_report, 'books_scraping.xlsx')) as writer:
-            dataframe = pd.DataFrame(bot.books)
-            dataframe['created_at'] = datetime.now()
-            dataframe.to_excel(writer, index=False, sheet_name='books')
-
-loop = asyncio.get_event_loop()
+    """
+        Function that runs the scraping process of the books and saves the report.
+
+        When a "client" is given, it is shared with other scrapers and its cache, parse pool and metrics are used.
+    """
 
-try:
-    loop.run_forever()
+    await run_scraper(BooksScraping, client, details=book_details)
 
-except Exception:
-    loop.close()
+if __name__ == '__main__':
+    asyncio.run(scrape_books())
@@ -0,0 +1,206 @@
+from functools import partial, lru_cache
+from time import time
+import hashlib
+import sqlite3
+import json
+import sys
+import os
+
+@lru_cache(maxsize=None)
+def module_version(module: str) -> str:
+
+    """
+        Function that returns the hash of the source file of a module, so any change to it gives a new version.
+    """
+
+    path = getattr(sys.modules.get(module), '__file__', None)
+    if path is None or not os.path.exists(path):
+        return ''
+
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+def extractor_key(extract: object) -> str:
+
+    """
+        Function that returns the identity of an extractor, to be added to the key of the entries of its data.
+
+        It is made of the module and the name of the function, the arguments bound by "partial", such as the
+        category of a page, and the version of the module, so two extractors of the same URL never share an
+        entry, and the entries extracted by an older version of the extractors are not used.
+    """
+
+    bound = []
+    while isinstance(extract, partial):
+        bound.append((extract.args, sorted(extract.keywords.items())))
+        extract = extract.func
+
+    module = getattr(extract, '__module__', '')
+    identity = f'{module}.{getattr(extract, "__qualname__", repr(extract))} {bound!r} {module_version(module)}'
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+class ResponseCache:
+
+    """
+        Class that keeps, on disk, the validators and the extracted data of every response.
+
+        Each entry is keyed by the URL and the "extractor_key" of its extractor, and stores the "ETag" and
+        "Last-Modified" headers, the hash of the body and the data extracted from it, so an unchanged page is
+        neither downloaded nor parsed again.
+        When the entries exceed "max_bytes", the least recently used ones are evicted.
+
+        Attributes
+        ----------
+        path: str
+            The path of the SQLite file.
+
+        max_bytes: int
+            The maximum size, in bytes, of the extracted data kept in the cache.
+
+        connection: sqlite3.Connection
+            The connection to the SQLite file.
+
+        size: int
+            The current size, in bytes, of the extracted data kept in the cache.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        get()
+            Function that returns the entry of a URL, or None if it is not cached.
+
+        touch()
+            Function that marks the entry of a URL as used and updates its validators.
+
+        put()
+            Function that stores the entry of a URL.
+
+        evict()
+            Function that removes the least recently used entries until the cache fits in "max_bytes".
+
+        close()
+            Function that saves the changes and closes the SQLite file.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    used_at REAL NOT NULL
+                )
+            '''
+        )
+
+        self.size: int = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def get(self: object, url: str) -> dict | None:
+
+        """
+            Function that returns the entry of a URL, or None if it is not cached.
+        """
+
+        entry = self.connection.execute(
+            'SELECT etag, last_modified, content_hash, value FROM responses WHERE url = ?',
+            (url,)
+        ).fetchone()
+
+        if entry is None:
+            return None
+
+        return {
+            'etag': entry[0],
+            'last_modified': entry[1],
+            'content_hash': entry[2],
+            'value': json.loads(entry[3])
+        }
+
+    def touch(self: object, url: str, etag: str | None = None, last_modified: str | None = None) -> None:
+
+        """
+            Function that marks the entry of a URL as used and updates its validators.
+        """
+
+        self.connection.execute(
+            '''
+                UPDATE responses
+                SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), used_at = ?
+                WHERE url = ?
+            ''',
+            (etag, last_modified, time(), url)
+        )
+
+    def put(self: object, url: str, etag: str | None, last_modified: str | None, content_hash: str, value: object) -> None:
+
+        """
+            Function that stores the entry of a URL.
+        """
+
+        value = json.dumps(value, ensure_ascii=False)
+
+        previous = self.connection.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+        if previous is not None:
+            self.size -= previous[0]
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, etag, last_modified, content_hash, value, len(value), time())
+        )
+        self.size += len(value)
+
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self: object) -> None:
+
+        """
+            Function that removes the least recently used entries until the cache fits in "max_bytes".
+        """
+
+        evicted = []
+        for url, size in self.connection.execute('SELECT url, size FROM responses ORDER BY used_at').fetchall():
+            if self.size <= self.max_bytes:
+                break
+
+            evicted.append((url,))
+            self.size -= size
+
+        self.connection.executemany('DELETE FROM responses WHERE url = ?', evicted)
+
+    def close(self: object) -> None:
+
+        """
+            Function that saves the changes and closes the SQLite file.
+        """
+
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,139 @@
+from time import time
+import sqlite3
+import json
+import os
+
+class Checkpoint:
+
+    """
+        Class that keeps, on disk, the steps of a scraping run that are already finished.
+
+        Each step is keyed by a name, such as the URL of a page, and stores the data collected in it,
+        so a run that fails can be started again collecting only the steps that are missing.
+        Every step is saved as soon as it is finished, and the checkpoint is cleared when the run succeeds.
+        Steps older than "max_age" seconds are discarded, so a failed run is not resumed with stale data.
+
+        Attributes
+        ----------
+        path: str
+            The path of the SQLite file.
+
+        max_age: float
+            The maximum age, in seconds, of the steps resumed.
+
+        connection: sqlite3.Connection
+            The connection to the SQLite file.
+
+        resumed: int
+            The number of steps that were resumed from the checkpoint.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        __len__()
+            Function that returns the number of finished steps.
+
+        get()
+            Function that returns the data of a finished step, or None if it is not finished.
+
+        put()
+            Function that saves the data of a finished step.
+
+        clear()
+            Function that removes all steps, used when the run succeeds.
+
+        close()
+            Function that saves the changes and closes the SQLite file.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        max_age: float = 12 * 60 * 60
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.path: str = path
+        self.max_age: float = max_age
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS steps (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    finished_at REAL NOT NULL
+                )
+            '''
+        )
+        self.connection.execute('DELETE FROM steps WHERE finished_at < ?', (time() - max_age,))
+        self.connection.commit()
+
+        self.resumed: int = 0
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def __len__(self: object) -> int:
+
+        """
+            Function that returns the number of finished steps.
+        """
+
+        return self.connection.execute('SELECT COUNT(*) FROM steps').fetchone()[0]
+
+    def get(self: object, key: str) -> object | None:
+
+        """
+            Function that returns the data of a finished step, or None if it is not finished.
+        """
+
+        step = self.connection.execute('SELECT value FROM steps WHERE key = ?', (key,)).fetchone()
+        if step is None:
+            return None
+
+        self.resumed += 1
+        return json.loads(step[0])
+
+    def put(self: object, key: str, value: object) -> None:
+
+        """
+            Function that saves the data of a finished step.
+
+            The step is committed at once, so it survives a crash of the process.
+        """
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO steps VALUES (?, ?, ?)',
+            (key, json.dumps(value, ensure_ascii=False), time())
+        )
+        self.connection.commit()
+
+    def clear(self: object) -> None:
+
+        """
+            Function that removes all steps, used when the run succeeds.
+        """
+
+        self.connection.execute('DELETE FROM steps')
+        self.connection.commit()
+
+    def close(self: object) -> None:
+
+        """
+            Function that saves the changes and closes the SQLite file.
+        """
+
+        self.connection.commit()
+        self.connection.close()
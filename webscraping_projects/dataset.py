@@ -0,0 +1,138 @@
+"""
+    Functions that store the snapshots of every run in a dataset partitioned by scraper and run date, and query it.
+
+    Every run writes its snapshot to "scraper=<name>/run_date=<YYYY-MM-DD>/<name>_<HHMMSS>.<format>", so
+    no run overwrites another. The queries select the partitions by their directory names and only read
+    the files of the dates asked for, instead of every file of the dataset. The hidden files, starting with
+    "." or "_", are the snapshots of the runs that failed and are not read.
+"""
+
+from datetime import datetime, date
+import argparse
+import os
+
+directory_dataset = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'dataset')
+
+readers: dict = {
+    '.parquet': 'read_parquet',
+    '.csv': 'read_csv',
+    '.jsonl': 'read_json'
+}
+
+def partition_path(scraper: str, run_at: datetime, directory: str = directory_dataset) -> str:
+
+    """
+        Function that returns the path, without extension, of the snapshot of a run.
+    """
+
+    return os.path.join(
+        directory,
+        f'scraper={scraper}',
+        f'run_date={run_at.strftime("%Y-%m-%d")}',
+        f'{scraper}_{run_at.strftime("%H%M%S")}'
+    )
+
+def list_snapshots(
+    scraper: str,
+    start: date | None = None,
+    end: date | None = None,
+    directory: str = directory_dataset
+) -> list:
+
+    """
+        Function that returns the run date and the path of every snapshot of a scraper between "start" and
+        "end", both included, in the order the runs happened.
+    """
+
+    directory_scraper = os.path.join(directory, f'scraper={scraper}')
+    if not os.path.isdir(directory_scraper):
+        return []
+
+    snapshots = []
+    for partition in sorted(os.listdir(directory_scraper)):
+        if not partition.startswith('run_date='):
+            continue
+
+        run_date = date.fromisoformat(partition.split('=', 1)[1])
+        if (start is not None and run_date < start) or (end is not None and run_date > end):
+            continue
+
+        for name in sorted(os.listdir(os.path.join(directory_scraper, partition))):
+            if not name.startswith(('.', '_')) and os.path.splitext(name)[1] in readers:
+                snapshots.append((run_date, os.path.join(directory_scraper, partition, name)))
+
+    return snapshots
+
+def read_snapshot(path: str, columns: list | None = None) -> object:
+
+    """
+        Function that reads a snapshot into a DataFrame, with only the given columns when "columns" is set.
+    """
+
+    import pandas as pd
+
+    extension = os.path.splitext(path)[1]
+    if extension == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+
+    data = getattr(pd, readers[extension])(path, **({'lines': True} if extension == '.jsonl' else {}))
+    return data[columns] if columns else data
+
+def read_latest(scraper: str, columns: list | None = None, directory: str = directory_dataset) -> object | None:
+
+    """
+        Function that reads the snapshot of the latest run of a scraper, or returns None if there is none.
+    """
+
+    snapshots = list_snapshots(scraper, directory=directory)
+    if not snapshots:
+        return None
+
+    return read_snapshot(snapshots[-1][1], columns)
+
+def read_history(
+    scraper: str,
+    start: date | None = None,
+    end: date | None = None,
+    columns: list | None = None,
+    directory: str = directory_dataset
+) -> object | None:
+
+    """
+        Function that reads the snapshots of all runs of a scraper between "start" and "end" into one DataFrame,
+        with a "run_date" column, or returns None if there is none.
+    """
+
+    import pandas as pd
+
+    snapshots = list_snapshots(scraper, start, end, directory)
+    if not snapshots:
+        return None
+
+    return pd.concat(
+        [read_snapshot(path, columns).assign(run_date=run_date) for run_date, path in snapshots],
+        ignore_index=True
+    )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Queries the snapshots of the scrapers stored in the dataset.')
+    parser.add_argument('scraper', help='The name of the scraper, such as "books_scraping".')
+    parser.add_argument('--start', type=date.fromisoformat, help='The first run date, as YYYY-MM-DD.')
+    parser.add_argument('--end', type=date.fromisoformat, help='The last run date, as YYYY-MM-DD.')
+    parser.add_argument('--latest', action='store_true', help='Reads only the snapshot of the latest run.')
+    parser.add_argument('--columns', nargs='+', help='The columns to read.')
+    parser.add_argument('--output', help='The path of a CSV file to save the result to.')
+    arguments = parser.parse_args()
+
+    if arguments.latest:
+        result = read_latest(arguments.scraper, arguments.columns)
+    else:
+        result = read_history(arguments.scraper, arguments.start, arguments.end, arguments.columns)
+
+    if result is None:
+        print(f'There are no snapshots of {arguments.scraper} in "{directory_dataset}".')
+    elif arguments.output:
+        result.to_csv(arguments.output, index=False)
+        print(f'Saved {len(result)} rows to "{arguments.output}".')
+    else:
+        print(result)
@@ -0,0 +1,233 @@
+from sinks import Sink, Columns, open_sink
+import hashlib
+import sqlite3
+import json
+import os
+
+class DeltaSink(Sink):
+
+    """
+        Class that writes only the rows that changed since the previous run to a delta file.
+
+        The previous run is kept as an index, in a SQLite file, of the key and the hash of every row.
+        Each row is compared with it and written to the delta file with a "change" column that is
+        "inserted" or "updated", and the rows of the previous run not seen again are written as "deleted",
+        with only their key. The full snapshot of the run can still be written to its own sink. Both files are
+        written under a hidden name that only takes their own when the run succeeds, so the delta of a run
+        that failed, without its deleted rows, is not read as a whole one, and its snapshot is not queried
+        with the others.
+        Rows that repeat a key in the same run are told apart by the order they are written in.
+
+        The index is only replaced when "finish" is called after a successful run, so a run that fails
+        does not report the rows it did not reach as deleted.
+
+        Attributes
+        ----------
+        keys: tuple
+            The columns that identify a row, such as the title and the category of a book.
+
+        index: sqlite3.Connection
+            The connection to the SQLite file of the index.
+
+        seen: dict
+            A dict that stores, per key, the number of rows written with it in this run.
+
+        written: set
+            A set that stores the keys of the index written in this run, with the order of the repeated ones.
+
+        changes: dict
+            A dict that stores the number of rows inserted, updated and deleted.
+
+        delta: Sink
+            The sink of the delta file.
+
+        delta_path: str
+            The path the delta file is moved to when the run succeeds.
+
+        snapshot: Sink | None
+            The sink of the full snapshot, or None to write only the delta file.
+
+        snapshot_path: str | None
+            The path the snapshot is moved to when the run succeeds.
+
+        finished: bool
+            Whether "finish" was called.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        fingerprint()
+            Function that returns the hash of a row.
+
+        write_batch()
+            Function that compares a batch of rows with the index and writes the changed ones to the delta file.
+
+        finish()
+            Function that writes the deleted rows and replaces the index, called when the run succeeds.
+
+        close()
+            Function that flushes the remaining rows and closes the files.
+
+        read()
+            Function that reads the snapshot, or the delta file without it, into a DataFrame.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        keys: tuple,
+        report_format: str = 'parquet',
+        snapshot: str | None = None,
+        **kwargs
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+
+            The delta file and the index are written to "path", without extension, with the "_delta" and
+            "_index" suffixes. The "snapshot" is the path of the snapshot, without extension, or None.
+        """
+
+        super().__init__(path, **kwargs)
+
+        self.keys: tuple = keys
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.index: sqlite3.Connection = sqlite3.connect(path + '_index.sqlite')
+        self.index.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS rows (
+                    key TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    fields TEXT NOT NULL
+                )
+            '''
+        )
+        self.index.commit()
+
+        self.seen: dict = {}
+        self.written: set = set()
+        self.changes: dict = {'inserted': 0, 'updated': 0, 'deleted': 0}
+
+        self.delta: Sink = open_sink(os.path.join(os.path.dirname(path), '.' + os.path.basename(path) + '_delta'), report_format)
+        self.delta_path: str = path + '_delta' + self.delta.extension
+        if os.path.exists(self.delta.path):
+            os.remove(self.delta.path)
+
+        self.snapshot: Sink | None = None
+        self.snapshot_path: str | None = None
+        if snapshot is not None:
+            self.snapshot = open_sink(os.path.join(os.path.dirname(snapshot), '.' + os.path.basename(snapshot)), report_format)
+            self.snapshot_path = snapshot + self.snapshot.extension
+
+        self.path = self.snapshot_path or self.delta_path
+        self.finished: bool = False
+
+    def fingerprint(self: object, row: dict) -> str:
+
+        """
+            Function that returns the hash of a row, without the constant columns such as "created_at".
+        """
+
+        return hashlib.sha1(
+            json.dumps(
+                {column: value for column, value in row.items() if column not in self.constants},
+                sort_keys=True,
+                ensure_ascii=False,
+                default=str
+            ).encode('utf-8')
+        ).hexdigest()
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function that compares a batch of rows with the index and writes the changed ones to the delta file.
+
+            The batch is written to the snapshot as it is, column by column.
+        """
+
+        changed = []
+        for row in columns.rows():
+            fields = {column: row.get(column) for column in self.keys}
+            key = json.dumps(list(fields.values()), ensure_ascii=False, default=str)
+            occurrence = self.seen.get(key, 0)
+            self.seen[key] = occurrence + 1
+            if occurrence:
+                key = json.dumps([*fields.values(), occurrence], ensure_ascii=False, default=str)
+
+            self.written.add(key)
+            row_hash = self.fingerprint(row)
+
+            previous = self.index.execute('SELECT hash FROM rows WHERE key = ?', (key,)).fetchone()
+            if previous is None or previous[0] != row_hash:
+                change = 'inserted' if previous is None else 'updated'
+                changed.append({**row, 'change': change})
+                self.changes[change] += 1
+
+                self.index.execute(
+                    'INSERT OR REPLACE INTO rows VALUES (?, ?, ?)',
+                    (key, row_hash, json.dumps(fields, ensure_ascii=False, default=str))
+                )
+
+        if self.snapshot is not None:
+            self.snapshot.write_batch(columns)
+        self.delta.write_many(changed)
+
+    def finish(self: object) -> None:
+
+        """
+            Function that writes the deleted rows and replaces the index, called when the run succeeds.
+        """
+
+        self.flush()
+
+        deleted = []
+        for key, fields in self.index.execute('SELECT key, fields FROM rows').fetchall():
+            if key not in self.written:
+                deleted.append((key, json.loads(fields)))
+
+        self.delta.write_many({**fields, 'change': 'deleted'} for _, fields in deleted)
+        self.index.executemany('DELETE FROM rows WHERE key = ?', ((key,) for key, _ in deleted))
+        self.changes['deleted'] += len(deleted)
+
+        self.index.commit()
+        self.finished = True
+
+    def close(self: object) -> None:
+
+        """
+            Function that flushes the remaining rows and closes the files.
+
+            The changes of the index not saved by "finish" are discarded, and the delta file and the snapshot
+            keep their hidden names.
+        """
+
+        super().close()
+
+        self.delta.close()
+        if self.finished and os.path.exists(self.delta.path):
+            os.replace(self.delta.path, self.delta_path)
+            self.delta.path = self.delta_path
+        elif self.snapshot is None:
+            self.path = self.delta.path
+
+        if self.snapshot is not None:
+            self.snapshot.close()
+            if self.finished and os.path.exists(self.snapshot.path):
+                os.replace(self.snapshot.path, self.snapshot_path)
+                self.snapshot.path = self.snapshot_path
+            else:
+                self.path = self.snapshot.path
+
+        self.index.rollback()
+        self.index.close()
+
+    def read(self: object) -> object:
+
+        """
+            Function that reads the snapshot, or the delta file without it, into a DataFrame.
+        """
+
+        return (self.snapshot or self.delta).read()
@@ -0,0 +1,246 @@
+"""
+    Functions that extract the rows of the scraped pages.
+
+    The HTML pages are parsed directly by lxml and queried with XPath expressions compiled once, at import,
+    and every field of an item is collected in a single pass over the item. The JSON lists are decoded
+    incrementally by ijson, item by item.
+"""
+
+from lxml import etree, html
+import ijson
+import re
+
+parser = html.HTMLParser(encoding='utf-8')
+
+def has_class(name: str) -> str:
+
+    """
+        Function that returns the XPath condition equivalent to the ".name" CSS selector.
+    """
+
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+categories_xpath = etree.XPath(
+    f'//div[{has_class("side_categories")}]//ul[count(preceding-sibling::*) = 1]//a[contains(@href, "catalogue/category/books")]'
+)
+quantity_items_xpath = etree.XPath(
+    f'(//form[{has_class("form-horizontal")}]//strong[count(preceding-sibling::*) = 1])[1]'
+)
+books_xpath = etree.XPath(f'//article[{has_class("product_pod")}]')
+book_fields_xpath = etree.XPath(
+    f'.//h3//a | .//div[{has_class("product_price")}]//p[{has_class("price_color")}] | .//div[{has_class("image_container")}]//img'
+)
+book_rating_xpath = etree.XPath(f'//div[{has_class("product_main")}]//p[{has_class("star-rating")}]')
+book_information_xpath = etree.XPath(f'//table[{has_class("table-striped")}]//tr')
+book_description_xpath = etree.XPath('//div[@id="product_description"]/following-sibling::p[1]')
+films_xpath = etree.XPath(f'//li[{has_class("ipc-metadata-list-summary-item")}]')
+film_fields_xpath = etree.XPath(
+    f'.//h3[{has_class("ipc-title__text")}] | .//div[contains(@class, "title-metadata")]/*[position() <= 2][self::span] | .//span[{has_class("ipc-rating-star--rating")}]'
+)
+
+price_pattern = re.compile(r'[^\d.]')
+review_pattern = re.compile(r'([0-9]\.[0-9])')
+availability_pattern = re.compile(r'\((\d+) available\)')
+ratings: dict = {'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
+
+def parse(content: bytes) -> html.HtmlElement:
+
+    """
+        Function that parses a page with lxml.
+    """
+
+    return html.document_fromstring(content, parser=parser)
+
+def extract_categories(content: bytes, url: str) -> list:
+
+    """
+        Function that extracts all available categories from the home page of books.toscrape.
+    """
+
+    return [
+        {
+            'category': category.text_content().strip(),
+            'url': (url + '/' + category.get('href')).replace('/index.html', '').strip(),
+            'pages': 0,
+            'books': []
+        }
+        for category in categories_xpath(parse(content))
+    ]
+
+def count_pages(document: html.HtmlElement) -> int:
+
+    """
+        Function that counts the number of pages of a parsed category page of books.toscrape.
+    """
+
+    quantity_items = quantity_items_xpath(document)
+    if not quantity_items or int(quantity_items[0].text_content()) == 0:
+        return 0
+    elif int(quantity_items[0].text_content()) % 20 == 0:
+        return int(quantity_items[0].text_content()) // 20
+    else:
+        return int(quantity_items[0].text_content()) // 20 + 1
+
+def collect_books(document: html.HtmlElement, url: str, category: str) -> list:
+
+    """
+        Function that collects all books of a parsed category page of books.toscrape.
+
+        The rating is only on the page of the book, so it is None until the details are collected.
+    """
+
+    books = []
+    for book in books_xpath(document):
+        title = book_url = price = image = None
+        for field in book_fields_xpath(book):
+            if field.tag == 'a' and title is None:
+                title = field.get('title')
+                book_url = url + '/catalogue/' + field.get('href').replace('../', '')
+            elif field.tag == 'p' and price is None:
+                price = float(price_pattern.sub('', field.text_content()))
+            elif field.tag == 'img' and image is None:
+                image = url + '/media' + field.get('src').split('/media')[-1]
+
+        books.append(
+            {
+                'category': category,
+                'book_title': title,
+                'book_price': price,
+                'book_image': image,
+                'book_rating': None,
+                'book_url': book_url
+            }
+        )
+
+    return books
+
+def extract_pages(content: bytes) -> int:
+
+    """
+        Function that extracts the number of pages from the first page of a category of books.toscrape.
+    """
+
+    return count_pages(parse(content))
+
+def extract_books(content: bytes, url: str, category: str) -> list:
+
+    """
+        Function that extracts all books from a page of a category of books.toscrape.
+    """
+
+    return collect_books(parse(content), url, category)
+
+def extract_first_page(content: bytes, url: str, category: str) -> dict:
+
+    """
+        Function that extracts the number of pages and the books from the first page of a category of books.toscrape.
+
+        The page is parsed once for both, so the first page does not need to be requested twice.
+    """
+
+    document = parse(content)
+    return {'pages': count_pages(document), 'books': collect_books(document, url, category)}
+
+def extract_book_details(content: bytes) -> dict:
+
+    """
+        Function that extracts the rating, the UPC, the availability and the description from the page of a book of books.toscrape.
+
+        A missing rating is None, so the column keeps the integer type of the others.
+    """
+
+    document = parse(content)
+
+    rating = book_rating_xpath(document)
+    information = {
+        row[0].text_content().strip(): row[1].text_content().strip()
+        for row in book_information_xpath(document) if len(row) == 2
+    }
+    availability = availability_pattern.search(information.get('Availability', ''))
+    description = book_description_xpath(document)
+
+    return {
+        'book_rating': next((ratings[name] for name in rating[0].get('class', '').split() if name in ratings), None) if rating else None,
+        'book_upc': information.get('UPC'),
+        'book_availability': int(availability.group(1)) if availability else 0,
+        'book_description': description[0].text_content().strip() if description else None
+    }
+
+def extract_films(content: bytes) -> list:
+
+    """
+        Function that extracts all films from the IMDb top chart.
+    """
+
+    films = []
+    for film in films_xpath(parse(content)):
+        name = review = None
+        metadata = []
+        for field in film_fields_xpath(film):
+            if field.tag == 'h3' and name is None:
+                name = field.text_content().split('.', 1)[-1].strip()
+            elif field.tag == 'span' and 'ipc-rating-star--rating' in field.get('class', '').split():
+                if review is None:
+                    review = review_pattern.search(field.text_content().strip()).group(1)
+            elif field.tag == 'span' and len(metadata) < 2:
+                metadata.append(field.text_content().strip())
+
+        films.append(
+            {
+                'film_name': name,
+                'film_year': metadata[0],
+                'film_duration': metadata[1],
+                'film_review': review
+            }
+        )
+
+    return films
+
+async def iterate_products(stream: object, fields: tuple | None = None) -> object:
+
+    """
+        Function that yields the products of the agrolink list while its body is still being received.
+
+        When "fields" is given, only those keys of each product are built; the values of the other keys
+        are skipped as they are read and never become Python objects. The numbers are decoded as floats, not
+        Decimals, as "json.loads" decodes them.
+    """
+
+    if fields is None:
+        async for product in ijson.items_async(stream, 'ViewModel.produtos.item', use_float=True):
+            yield product
+        return
+
+    item_prefix = 'ViewModel.produtos.item'
+    product = key = builder = None
+    depth = 0
+    async for prefix, event, value in ijson.parse_async(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+
+            if depth == 0:
+                product[key] = builder.value
+                builder = None
+
+        elif prefix == item_prefix and event == 'start_map':
+            product = {}
+
+        elif prefix == item_prefix and event == 'map_key':
+            key = value
+
+        elif prefix == item_prefix and event == 'end_map':
+            yield product
+            product = None
+
+        elif product is not None and key in fields and prefix == item_prefix + '.' + key:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth = 1
+            else:
+                product[key] = builder.value
+                builder = None
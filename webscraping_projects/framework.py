@@ -0,0 +1,707 @@
+from datetime import datetime
+from metrics import Metrics, profiled
+from sinks import Sink, MemorySink, open_sink
+from delta import DeltaSink
+from dataset import partition_path
+from http_client import HttpClient
+from cache import ResponseCache
+from checkpoint import Checkpoint
+from assets import AssetStore
+from archive import ResponseArchive, ArchiveReader
+from frontier import Frontier, SqliteFrontier
+from lease import Lease
+from contextlib import AsyncExitStack
+from pipeline import ParsePool
+from typing import NamedTuple
+from time import time
+from colorama import Fore
+import asyncio
+import socket
+import json
+import sys
+import os
+
+directory_tmp = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP')
+
+report_format = os.environ.get('REPORT_FORMAT', 'parquet')
+report_excel = os.environ.get('REPORT_EXCEL', '0') == '1'
+report_snapshot = os.environ.get('REPORT_SNAPSHOT', '1') == '1'
+profiler = os.environ.get('PROFILER')
+parse_workers = int(os.environ.get('PARSE_WORKERS', '0'))
+download_assets = os.environ.get('DOWNLOAD_ASSETS', '0') == '1'
+archive_responses = os.environ.get('ARCHIVE_RESPONSES', '0') == '1'
+replay = os.environ.get('REPLAY', '0') == '1'
+replay_run = os.environ.get('REPLAY_RUN')
+archive_run = os.environ.get('ARCHIVE_RUN')
+http2 = os.environ.get('HTTP2', '0') == '1'
+frontier_enabled = os.environ.get('FRONTIER', '0') == '1'
+frontier_role = os.environ.get('FRONTIER_ROLE', 'coordinator')
+frontier_workers = int(os.environ.get('FRONTIER_WORKERS', '0'))
+frontier_directory = os.environ.get('FRONTIER_DIRECTORY')
+
+class Page(NamedTuple):
+
+    """
+        Class that declares a page to collect.
+
+        "extract" receives the body of the page and returns its data. "decode" instead receives the body
+        while it is received and yields the rows one by one, and such a page has no pagination or checkpoint.
+        "step" names the kind of page in the checkpoint, and "context" is any data the scraper needs to
+        paginate it, such as its category. "options" are the extra arguments of the request, such as "params".
+    """
+
+    url: str
+    description: str
+    extract: object = None
+    decode: object = None
+    method: str = 'GET'
+    step: str = 'page'
+    context: object = None
+    options: dict | None = None
+
+def page_key(page: Page) -> str:
+
+    """
+        Function that returns the key of a page in the checkpoint and the frontier, from its step and its URL,
+        and its options when it has any, such as the form of a POST request.
+    """
+
+    return f'{page.step} {page.url}' + (f' {json.dumps(page.options, sort_keys=True, default=str)}' if page.options else '')
+
+class Scraper:
+
+    """
+        Base class of the scrapers, which only declare what to collect.
+
+        A scraper declares its "name", "URL" and the "keys" of its rows, and implements "seeds" to return
+        the first pages to collect. "paginate" returns the remaining pages of a seed from its data, "rows"
+        returns the rows of a page from its data and "enrich" adds data to the rows of a page. The files
+        linked by its "asset_columns", such as images, can be downloaded, with their paths added to the rows.
+        The fetching, retries, cache, checkpoint, concurrency and ordered output are shared by all of them.
+
+        With a "frontier", the pages are instead pulled from a queue shared by several worker processes: the
+        coordinator pushes the seeds, every worker collects the pages it pulls and pushes the pages they give,
+        and the coordinator writes the rows stored in the frontier, in order, once every page is collected.
+
+        Attributes
+        ----------
+        name: str
+            The name of the scraper, used for its reports, cache, checkpoint and metrics.
+
+        URL: str
+            The URL of the website to scrape.
+
+        keys: tuple
+            The columns that identify a row, used to find the rows changed since the previous run.
+
+        categorical: tuple
+            The columns whose strings repeat across rows, such as a category, kept once in memory.
+
+        sheet_name: str
+            The name of the sheet of the excel report.
+
+        cached: bool
+            Whether the responses are kept in a cache, to skip unchanged pages.
+
+        checkpointed: bool
+            Whether the pages collected are kept in a checkpoint, to resume a run that failed.
+
+        asset_columns: tuple
+            The columns that link to files, such as images, downloaded when there is an asset store.
+
+        concurrency: int
+            The maximum number of requests in flight across all hosts.
+
+        concurrency_per_host: int
+            The maximum number of requests in flight against the same host.
+
+        sink: Sink
+            The output sink that receives the scraped rows.
+
+        metrics: Metrics | None
+            The metrics of the run, recorded by the client opened by the scraper.
+
+        cache: ResponseCache | None
+            The cache of the responses, used to skip unchanged pages.
+
+        parse_workers: int
+            The number of worker processes that parse the pages, or 0 to parse them in the event loop.
+
+        checkpoint: Checkpoint | None
+            The checkpoint of the run, used to skip the pages collected by a previous run that failed.
+
+        assets: AssetStore | None
+            The store the files of the "asset_columns" are downloaded to, or None to not download them.
+
+        archive: ResponseArchive | None
+            The archive the responses are appended to by the client opened by the scraper.
+
+        replay: ArchiveReader | None
+            The archive the client opened by the scraper reads the responses from, instead of the network.
+
+        frontier: Frontier | None
+            The queue of the pages shared by the workers of the run, or None to collect them all in this process.
+
+        worker: bool
+            Whether the scraper only collects the pages of the frontier, while another process coordinates the run.
+
+        workers: int
+            The number of worker processes started by the coordinator, which also collects pages itself.
+
+        stopping: bool
+            Whether the pages of the frontier still being collected were cancelled, as the worker stops.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        start()
+            Function responsible for controlling the scraping process.
+
+        seeds()
+            Function implemented by each scraper to return the first pages to collect.
+
+        paginate()
+            Function that returns the remaining pages of a seed from its data, none by default.
+
+        rows()
+            Function that returns the rows of a page from its data, the data itself by default.
+
+        enrich()
+            Function that adds data to the rows of a page, nothing by default.
+
+        download()
+            Function that downloads the files linked by the rows of a page and adds their paths to the rows.
+
+        write()
+            Function that writes the rows of a page to the sink.
+
+        fetch()
+            Function that collects the data of a page, unless it was already collected by a previous run.
+
+        collect()
+            Function that collects the rows of a page.
+
+        crawl()
+            Function that collects the rows of all pages of a seed.
+
+        scraping()
+            Function that collects all rows from all seeds.
+
+        work_on()
+            Function that collects a page pulled from the frontier and stores its rows and pages in it.
+
+        work()
+            Function that collects the pages of the frontier until every one is collected.
+
+        distribute()
+            Function that seeds the frontier, starts the workers and writes the rows they collected.
+    """
+
+    name: str = ''
+    URL: str = ''
+    keys: tuple = ()
+    categorical: tuple = ()
+    sheet_name: str = ''
+    cached: bool = True
+    checkpointed: bool = False
+    asset_columns: tuple = ()
+
+    def __init__(
+        self: object,
+        concurrency: int = 20,
+        concurrency_per_host: int = 10,
+        sink: Sink | None = None,
+        metrics: Metrics | None = None,
+        cache: ResponseCache | None = None,
+        parse_workers: int = 0,
+        checkpoint: Checkpoint | None = None,
+        assets: AssetStore | None = None,
+        archive: ResponseArchive | None = None,
+        replay: ArchiveReader | None = None,
+        frontier: Frontier | None = None,
+        worker: bool = False,
+        workers: int = 0
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.concurrency: int = concurrency
+        self.concurrency_per_host: int = concurrency_per_host
+
+        self.sink: Sink = sink or MemorySink()
+
+        self.metrics: Metrics | None = metrics
+
+        self.cache: ResponseCache | None = cache
+
+        self.parse_workers: int = parse_workers
+
+        self.checkpoint: Checkpoint | None = checkpoint
+
+        self.assets: AssetStore | None = assets
+
+        self.archive: ResponseArchive | None = archive
+        self.replay: ArchiveReader | None = replay
+
+        self.frontier: Frontier | None = frontier
+        self.worker: bool = worker
+        self.workers: int = workers
+        self.stopping: bool = False
+
+    async def start(self: object, client: HttpClient | None = None) -> None:
+
+        """
+            Function responsible for controlling the scraping process.
+
+            When no "client" is given, one is opened with the concurrency, cache, parse workers and archives of the scraper,
+            over HTTP/2 with HTTP2.
+        """
+
+        if client is not None:
+            await self.scraping(client)
+            return
+
+        async with AsyncExitStack() as stack:
+            parse_pool = await stack.enter_async_context(ParsePool(self.parse_workers)) if self.parse_workers else None
+            client = await stack.enter_async_context(
+                HttpClient(
+                    concurrency=self.concurrency,
+                    concurrency_per_host=self.concurrency_per_host,
+                    cache=self.cache,
+                    parse_pool=parse_pool,
+                    metrics=self.metrics,
+                    archive=self.archive,
+                    replay=self.replay,
+                    http2=http2
+                )
+            )
+
+            await self.scraping(client)
+
+    async def seeds(self: object, client: HttpClient) -> list:
+
+        """
+            Function implemented by each scraper to return the first pages to collect.
+        """
+
+        raise NotImplementedError
+
+    def paginate(self: object, page: Page, data: object) -> list:
+
+        """
+            Function that returns the remaining pages of a seed from its data, none by default.
+        """
+
+        return []
+
+    def rows(self: object, page: Page, data: object) -> list:
+
+        """
+            Function that returns the rows of a page from its data, the data itself by default.
+        """
+
+        return data
+
+    async def enrich(self: object, client: HttpClient, rows: list) -> list:
+
+        """
+            Function that adds data to the rows of a page, nothing by default.
+        """
+
+        return rows
+
+    async def download(self: object, client: HttpClient, rows: list) -> list:
+
+        """
+            Function that downloads the files linked by the rows of a page and adds their paths to the rows.
+
+            The path of the file of each of the "asset_columns" is added as "<column>_path", or None when the
+            row has no link or the download failed. The files are downloaded concurrently, each one once per run.
+        """
+
+        if self.assets is None or not self.asset_columns:
+            return rows
+
+        rows = [{**row, **{f'{column}_path': None for column in self.asset_columns}} for row in rows]
+        links = [(row, column) for row in rows for column in self.asset_columns if row.get(column)]
+        paths = await client.gather(*(self.assets.fetch(client, row[column]) for row, column in links))
+        for (row, column), path in zip(links, paths):
+            row[f'{column}_path'] = path
+
+        return rows
+
+    def write(self: object, rows: list) -> None:
+
+        """
+            Function that writes the rows of a page to the sink.
+        """
+
+        self.sink.write_many(rows)
+
+    async def fetch(self: object, client: HttpClient, page: Page) -> object:
+
+        """
+            Function that collects the data of a page, unless it was already collected by a previous run.
+
+            The data is saved in the checkpoint as soon as it is collected, keyed by "page_key".
+        """
+
+        key = page_key(page)
+        if self.checkpoint is not None:
+            data = self.checkpoint.get(key)
+            if data is not None:
+                return data
+
+        if page.method == 'GET':
+            data = await client.get_extracted(page.url, page.description, page.extract, **(page.options or {}))
+        else:
+            data = await client.run_extract(
+                page.extract,
+                (await client.request(page.method, page.url, page.description, **(page.options or {}))).content
+            )
+
+        if self.checkpoint is not None:
+            self.checkpoint.put(key, data)
+
+        return data
+
+    async def collect(self: object, client: HttpClient, page: Page, data: object | None = None) -> list:
+
+        """
+            Function that collects the rows of a page, from its "data" when it is already collected.
+        """
+
+        if data is None:
+            data = await self.fetch(client, page)
+
+        return await self.download(client, await self.enrich(client, self.rows(page, data)))
+
+    async def crawl(self: object, client: HttpClient, seed: Page) -> list:
+
+        """
+            Function that collects the rows of all pages of a seed.
+
+            The seed gives the remaining pages, which are then collected concurrently.
+            Returns the rows of every page, in page order.
+        """
+
+        data = await self.fetch(client, seed)
+        return await client.gather(
+            self.collect(client, seed, data),
+            *(self.collect(client, page) for page in self.paginate(seed, data))
+        )
+
+    async def scraping(self: object, client: HttpClient) -> None:
+
+        """
+            Function that collects all rows from all seeds.
+
+            Every seed is crawled concurrently. The rows are written to the sink as soon as their seed and all
+            the seeds before it are collected, so they keep the seed and page order. The rows of the seeds with
+            a "decode" function are written while they are received. With a frontier, the pages are collected
+            by its workers instead.
+        """
+
+        if self.frontier is not None:
+            await (self.work(client) if self.worker else self.distribute(client))
+            return
+
+        seeds = await self.seeds(client)
+
+        for seed in seeds:
+            if seed.decode is not None:
+                async for row in client.request_items(seed.method, seed.url, seed.description, seed.decode, **(seed.options or {})):
+                    self.sink.write(row)
+
+        seeds = [seed for seed in seeds if seed.decode is None]
+        async for pages in client.stream(*(self.crawl(client, seed) for seed in seeds)):
+            for rows in pages:
+                self.write(rows)
+
+    async def work_on(self: object, client: HttpClient, task_id: int, lease: str, task: tuple) -> None:
+
+        """
+            Function that collects a page pulled from the frontier and stores its rows and pages in it.
+
+            The task is the page and whether it is a seed, as only the seeds give the remaining pages. A page that
+            fails is given back to the frontier, to be tried again by any worker, as is one that received the
+            cancellation of a request it shared with another page, unless the worker is stopping and cancelled it.
+        """
+
+        page, seed = task
+        try:
+            data = await self.fetch(client, page)
+            pages = self.paginate(page, data) if seed else []
+            rows = await self.collect(client, page, data)
+
+        except (Exception, asyncio.CancelledError) as e:
+            if isinstance(e, asyncio.CancelledError) and self.stopping:
+                raise
+
+            print(f'It was not possible to collect {page.description}. Error: {e}.')
+            self.frontier.fail(task_id, lease)
+            return
+
+        self.frontier.complete(task_id, lease, rows, [(page_key(page), (page, False)) for page in pages])
+
+    async def work(self: object, client: HttpClient, poll_interval: float = 0.5, idle_timeout: float = 60.0) -> None:
+
+        """
+            Function that collects the pages of the frontier until every one is collected.
+
+            Up to "concurrency" pages are collected at once, and more are pulled as soon as some are done. While
+            the other workers still hold pages, the frontier is polled every "poll_interval" seconds, as they may
+            give more pages or fail. A worker started before the frontier is seeded waits up to "idle_timeout" seconds.
+        """
+
+        worker = f'{socket.gethostname()}-{os.getpid()}'
+        started_at = time()
+        running = set()
+
+        try:
+            while True:
+                if len(running) < self.concurrency:
+                    for task_id, lease, task in self.frontier.pull(worker, self.concurrency - len(running)):
+                        running.add(asyncio.ensure_future(self.work_on(client, task_id, lease, task)))
+
+                if running:
+                    done, running = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                    continue
+
+                if self.frontier.finished():
+                    return
+
+                if not self.frontier.seeded() and time() - started_at > idle_timeout:
+                    raise Exception(f'The frontier of {self.name} was not seeded within {idle_timeout} seconds.')
+
+                await asyncio.sleep(poll_interval)
+
+        finally:
+            self.stopping = True
+            for task in running:
+                task.cancel()
+
+    async def distribute(self: object, client: HttpClient) -> None:
+
+        """
+            Function that seeds the frontier, starts the workers and writes the rows they collected.
+
+            A frontier left by a run that failed is not seeded again: its failed pages are tried again and the pages
+            already collected are kept, unless it is stale, when it is cleared and seeded again. The workers run the module of the scraper with FRONTIER_ROLE=worker, so they
+            share the frontier of this run. The rows of the seeds with a "decode" function are written while they are
+            received, as they are not split in pages.
+        """
+
+        seeds = await self.seeds(client)
+
+        for seed in seeds:
+            if seed.decode is not None:
+                async for row in client.request_items(seed.method, seed.url, seed.description, seed.decode, **(seed.options or {})):
+                    self.sink.write(row)
+
+        if self.frontier.stale():
+            print('Discarding the frontier of the previous run, seeded too long ago.')
+            self.frontier.clear()
+
+        if self.frontier.seeded():
+            print('Resuming the previous run from its frontier.')
+            self.frontier.retry()
+        else:
+            self.frontier.seed([(page_key(seed), (seed, True)) for seed in seeds if seed.decode is None])
+
+        environment = {**os.environ, 'FRONTIER': '1', 'FRONTIER_ROLE': 'worker', 'FRONTIER_DIRECTORY': os.path.dirname(frontier_path(self.name))}
+        if self.archive is not None:
+            environment['ARCHIVE_RUN'] = self.archive.run
+        processes = [
+            await asyncio.create_subprocess_exec(sys.executable, sys.modules[type(self).__module__].__file__, '--once', env=environment)
+            for _ in range(self.workers)
+        ]
+
+        try:
+            await self.work(client)
+            for process in processes:
+                await process.wait()
+
+        finally:
+            for process in processes:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+        failed = self.frontier.failed()
+        if failed:
+            raise Exception(f'{failed} pages of the frontier could not be collected.')
+
+        for rows in self.frontier.results():
+            self.write(rows)
+
+def frontier_path(name: str) -> str:
+
+    """
+        Function that returns the path of the frontier of a scraper, in FRONTIER_DIRECTORY or in the temporary directory.
+    """
+
+    return os.path.join(frontier_directory or os.path.join(directory_tmp, 'frontier'), f'{name}.sqlite')
+
+async def run_scraper(scraper_class: type, client: HttpClient | None = None, **options) -> None:
+
+    """
+        Function that runs the scraping process of a scraper and saves its reports, unless it is already running.
+
+        The run holds the lease of the scraper, so two runs, in this process or in others, never write the same
+        reports at once. A run that finds the lease taken is skipped. The lease is renewed while the run goes on.
+        When a "client" is given, it is shared with other scrapers and its cache, parse pool and metrics are used.
+        The "options" are the extra arguments of the scraper.
+        With FRONTIER_ROLE=worker, the process is a worker of a run coordinated by another one, and holds no lease.
+    """
+
+    if frontier_enabled and frontier_role == 'worker':
+        await run_worker(scraper_class, **options)
+        return
+
+    lease = Lease(os.path.join(directory_tmp, 'locks', f'{scraper_class.name}.lock'))
+    if not lease.acquire():
+        print(f'Skipping the {scraper_class.name} run, because another run of it is still in progress.')
+        return
+
+    renewal = asyncio.ensure_future(lease.keep())
+    try:
+        await run_scraping(scraper_class, client, **options)
+
+    finally:
+        renewal.cancel()
+        lease.release()
+
+async def run_worker(scraper_class: type, **options) -> None:
+
+    """
+        Function that runs a worker of the scraping process of a scraper, which collects the pages of its frontier.
+
+        The rows are stored in the frontier, and the reports are saved by the coordinator of the run. The worker
+        has no cache or checkpoint, as the frontier keeps what was collected, but downloads and archives as the
+        coordinator does, its responses archived under the run of the coordinator, given by ARCHIVE_RUN.
+    """
+
+    init_time = time()
+    name = scraper_class.name
+
+    frontier = SqliteFrontier(frontier_path(name))
+    started_at = datetime.strptime(archive_run, '%Y%m%d_%H%M%S') if archive_run else None
+    archive = ResponseArchive(os.path.join(directory_tmp, 'archive', name), started_at) if archive_responses else None
+    assets = AssetStore(os.path.join(directory_tmp, 'assets')) if download_assets and scraper_class.asset_columns else None
+
+    try:
+        bot = scraper_class(parse_workers=parse_workers, assets=assets, archive=archive, frontier=frontier, worker=True, **options)
+        await bot.start()
+
+    except Exception as e:
+        print(f'Fail of the worker {os.getpid()} of the scraping process. Error: {e}.')
+
+    else:
+        print(f'Worker {os.getpid()} of the scraping process completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
+
+    finally:
+        if assets is not None:
+            assets.close()
+        if archive is not None:
+            archive.close()
+        frontier.close()
+
+async def run_scraping(scraper_class: type, client: HttpClient | None = None, **options) -> None:
+
+    """
+        Function that runs the scraping process of a scraper and saves its reports.
+
+        With ARCHIVE_RESPONSES, every response is archived, and with REPLAY, the run reads the responses from
+        the archives of the previous runs instead of the network, with no cache, checkpoint or downloads, so
+        the reports are extracted again from what was already collected. REPLAY_RUN picks the run replayed,
+        by the time it started as "YYYYmmdd_HHMMSS", instead of the latest response of every run. A replay
+        saves its report in the "replay" directory, with no snapshot or delta, so the history of the live runs
+        and the changes counted by the next one are left as they were.
+        With FRONTIER, the pages are collected by FRONTIER_WORKERS worker processes besides this one, through a
+        frontier kept until the run succeeds, which takes the place of the checkpoint.
+    """
+
+    init_time = time()
+    name = scraper_class.name
+    created_at = datetime.now()
+
+    replaying = replay if client is None else client.replay is not None
+    if replaying:
+        run = replay_run if client is None else client.replay.run
+        directory_report = os.path.join(directory_tmp, 'replay', name)
+        sink = open_sink(os.path.join(directory_report, f'{name}_{run or "latest"}'), report_format, constants={'created_at': created_at}, categorical=scraper_class.categorical)
+    else:
+        directory_report = os.path.join(directory_tmp, name)
+        snapshot = partition_path(name, created_at, os.path.join(directory_tmp, 'dataset')) if report_snapshot else None
+        sink = DeltaSink(os.path.join(directory_report, name), scraper_class.keys, report_format, snapshot, constants={'created_at': created_at}, categorical=scraper_class.categorical)
+
+    metrics = Metrics(name) if client is None else client.metrics
+    directory_archive = os.path.join(directory_tmp, 'archive', name)
+    archive = ResponseArchive(directory_archive, created_at) if client is None and archive_responses and not replaying else None
+    reader = ArchiveReader(directory_archive, replay_run) if client is None and replaying else None
+    if reader is not None:
+        print(f'Replaying the run {replay_run or "latest"} from {Fore.GREEN}{len(reader)}{Fore.RESET} archived responses in the "{directory_archive}" directory.')
+
+    cache = ResponseCache(os.path.join(directory_tmp, 'cache', f'{name}.sqlite')) if client is None and scraper_class.cached and not replaying else None
+    frontier = SqliteFrontier(frontier_path(name)) if frontier_enabled and not replaying else None
+    checkpoint = Checkpoint(os.path.join(directory_tmp, 'checkpoints', f'{name}.sqlite')) if scraper_class.checkpointed and not replaying and frontier is None else None
+    assets = AssetStore(os.path.join(directory_tmp, 'assets')) if download_assets and scraper_class.asset_columns and not replaying else None
+    if checkpoint is not None and len(checkpoint):
+        print(f'Resuming the previous run from {Fore.GREEN}{len(checkpoint)}{Fore.RESET} pages already collected.')
+
+    try:
+        bot = scraper_class(sink=sink, metrics=metrics, cache=cache, parse_workers=parse_workers, checkpoint=checkpoint, assets=assets, archive=archive, replay=reader, frontier=frontier, workers=frontier_workers, **options)
+
+        with profiled(profiler if client is None else None, os.path.join(directory_report, f'{name}_profile')):
+            await bot.start(client)
+
+    except Exception as e:
+        print(f'Fail of the scraping process. Error: {e}.')
+        if checkpoint is not None:
+            print(f'The next run will resume from {len(checkpoint)} pages already collected.')
+
+    else:
+        if checkpoint is not None:
+            checkpoint.clear()
+        if frontier is not None:
+            frontier.clear()
+        if isinstance(sink, DeltaSink):
+            sink.finish()
+            print(f'Changes since the previous run: {sink.changes["inserted"]} inserted, {sink.changes["updated"]} updated and {sink.changes["deleted"]} deleted rows.')
+        if assets is not None:
+            print(f'Files: {assets.counts["downloaded"]} downloaded, {assets.counts["present"]} already present, {assets.counts["duplicated"]} duplicated and {assets.counts["failed"]} failed.')
+        print(f'Scraping process successfully completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
+
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if frontier is not None:
+            frontier.close()
+        if cache is not None:
+            cache.close()
+        if assets is not None:
+            assets.close()
+        if archive is not None:
+            archive.close()
+            print(f'Archived {archive.records} responses in the {Fore.GREEN}"{archive.path}"{Fore.RESET} archive.')
+        if reader is not None:
+            reader.close()
+        sink.close()
+        print(f'Saved {sink.rows} rows in the {Fore.GREEN}"{sink.path}"{Fore.RESET} report.')
+
+        if metrics is not None:
+            metrics.record_sink(name, sink.rows, sink.write_time)
+            if client is None:
+                metrics.finish()
+                metrics.save(directory_report)
+
+        if report_excel and sink.rows:
+            print(f'Exporting the collected data to an excel report in the {Fore.GREEN}"{directory_report}"{Fore.RESET} directory.')
+            sink.export_excel(os.path.join(directory_report, f'{name}.xlsx'), scraper_class.sheet_name)
@@ -0,0 +1,397 @@
+from time import time
+import pickle
+import sqlite3
+import json
+import uuid
+import os
+
+class Frontier:
+
+    """
+        Base class of the crawl frontiers, the queues of the pages to collect shared by the workers of a run.
+
+        A task is leased to the worker that pulls it, and is pulled again by another worker when the lease
+        is not completed within the visibility timeout, such as when its worker died. Tasks are deduplicated
+        by their key, so a page reached twice is only collected once. Completing a task stores its rows and
+        pushes the pages it found at once, and the rows are read back in the order of the seeds and of the
+        pages of each seed. The frontier is kept until the run succeeds, so a run that failed resumes from it,
+        unless it was seeded more than "max_age" seconds ago, so the pages of an old run are collected again.
+
+        A backend implements every method, so a network queue can take the place of the SQLite one.
+
+        Methods
+        -------
+        seed()
+            Function that pushes the first tasks of a run.
+
+        seeded()
+            Function that returns whether the run was seeded.
+
+        stale()
+            Function that returns whether the run was seeded more than "max_age" seconds ago.
+
+        pull()
+            Function that leases up to "limit" tasks to a worker.
+
+        complete()
+            Function that stores the rows of a task and pushes the tasks it found.
+
+        fail()
+            Function that gives a task back, to be tried again until it fails "max_attempts" times.
+
+        finished()
+            Function that returns whether every task of a seeded run was completed or failed.
+
+        failed()
+            Function that returns the number of failed tasks.
+
+        retry()
+            Function that gives the failed and leased tasks back, to be tried again by a new run.
+
+        results()
+            Function that yields the rows of every completed task, in the order of the seeds and of their tasks.
+
+        clear()
+            Function that removes every task, called when the run succeeds.
+
+        close()
+            Function that closes the frontier.
+    """
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def seed(self: object, tasks: list) -> None:
+
+        """
+            Function that pushes the first tasks of a run, as (key, task) tuples.
+        """
+
+        raise NotImplementedError
+
+    def seeded(self: object) -> bool:
+
+        """
+            Function that returns whether the run was seeded.
+        """
+
+        raise NotImplementedError
+
+    def stale(self: object) -> bool:
+
+        """
+            Function that returns whether the run was seeded more than "max_age" seconds ago.
+        """
+
+        raise NotImplementedError
+
+    def pull(self: object, worker: str, limit: int) -> list:
+
+        """
+            Function that leases up to "limit" tasks to a worker, as (id, lease, task) tuples.
+        """
+
+        raise NotImplementedError
+
+    def complete(self: object, task_id: int, lease: str, rows: list, tasks: list) -> bool:
+
+        """
+            Function that stores the rows of a task and pushes the tasks it found, as (key, task) tuples.
+
+            Returns False, storing nothing, when the lease expired and the task was given to another worker.
+        """
+
+        raise NotImplementedError
+
+    def fail(self: object, task_id: int, lease: str) -> None:
+
+        """
+            Function that gives a task back, to be tried again until it fails "max_attempts" times.
+        """
+
+        raise NotImplementedError
+
+    def finished(self: object) -> bool:
+
+        """
+            Function that returns whether every task of a seeded run was completed or failed.
+        """
+
+        raise NotImplementedError
+
+    def failed(self: object) -> int:
+
+        """
+            Function that returns the number of failed tasks.
+        """
+
+        raise NotImplementedError
+
+    def retry(self: object) -> None:
+
+        """
+            Function that gives the failed and leased tasks back, to be tried again by a new run.
+        """
+
+        raise NotImplementedError
+
+    def results(self: object) -> object:
+
+        """
+            Function that yields the rows of every completed task, in the order of the seeds and of their tasks.
+        """
+
+        raise NotImplementedError
+
+    def clear(self: object) -> None:
+
+        """
+            Function that removes every task, called when the run succeeds.
+        """
+
+        raise NotImplementedError
+
+    def close(self: object) -> None:
+
+        """
+            Function that closes the frontier.
+        """
+
+        raise NotImplementedError
+
+class SqliteFrontier(Frontier):
+
+    """
+        Class that keeps the frontier in a SQLite file, shared by the worker processes of the same host.
+
+        The tasks are pickled, and the file is in WAL mode with every lease taken in an immediate transaction,
+        so the workers never pull the same task at once. The SQLite file must be on a local disk, since SQLite
+        does not lock reliably over network file systems; the workers of several hosts need a network backend.
+
+        Attributes
+        ----------
+        path: str
+            The path of the SQLite file.
+
+        visibility_timeout: float
+            The time, in seconds, after which a task leased and not completed is given to another worker.
+
+        max_attempts: int
+            The number of times a task is tried before it is considered failed.
+
+        max_age: float
+            The maximum age, in seconds, of a run resumed from the frontier.
+
+        connection: sqlite3.Connection
+            The connection to the SQLite file.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        push()
+            Function that pushes new tasks, ignoring the ones already pushed.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        visibility_timeout: float = 5 * 60,
+        max_attempts: int = 3,
+        max_age: float = 12 * 60 * 60
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.path: str = path
+        self.visibility_timeout: float = visibility_timeout
+        self.max_attempts: int = max_attempts
+        self.max_age: float = max_age
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(
+            '''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    root INTEGER,
+                    task BLOB NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease TEXT,
+                    lease_until REAL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_until);
+                CREATE TABLE IF NOT EXISTS results (
+                    task_id INTEGER PRIMARY KEY,
+                    rows TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS runs (
+                    seeded_at REAL NOT NULL
+                );
+            '''
+        )
+
+    def push(self: object, tasks: list, root: int | None = None) -> None:
+
+        """
+            Function that pushes new tasks, ignoring the ones already pushed.
+
+            Each task belongs to the "root" task it was found from, or is a root itself.
+        """
+
+        for key, task in tasks:
+            cursor = self.connection.execute(
+                'INSERT OR IGNORE INTO tasks (key, root, task) VALUES (?, ?, ?)',
+                (key, root, pickle.dumps(task))
+            )
+            if root is None and cursor.rowcount:
+                self.connection.execute('UPDATE tasks SET root = id WHERE id = ?', (cursor.lastrowid,))
+
+    def seed(self: object, tasks: list) -> None:
+
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.push(tasks)
+            self.connection.execute('INSERT INTO runs VALUES (?)', (time(),))
+            self.connection.execute('COMMIT')
+
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    def seeded(self: object) -> bool:
+
+        return self.connection.execute('SELECT COUNT(*) FROM runs').fetchone()[0] > 0
+
+    def stale(self: object) -> bool:
+
+        seeded_at = self.connection.execute('SELECT MAX(seeded_at) FROM runs').fetchone()[0]
+        return seeded_at is not None and time() - seeded_at > self.max_age
+
+    def pull(self: object, worker: str, limit: int) -> list:
+
+        now = time()
+        lease = uuid.uuid4().hex
+
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.execute(
+                '''
+                    UPDATE tasks SET state = 'failed', worker = NULL, lease = NULL
+                    WHERE state = 'leased' AND lease_until < ? AND attempts >= ?
+                ''',
+                (now, self.max_attempts)
+            )
+            tasks = self.connection.execute(
+                '''
+                    SELECT id, task FROM tasks
+                    WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)
+                    ORDER BY root, id
+                    LIMIT ?
+                ''',
+                (now, limit)
+            ).fetchall()
+            self.connection.executemany(
+                '''
+                    UPDATE tasks SET state = 'leased', attempts = attempts + 1, worker = ?, lease = ?, lease_until = ?
+                    WHERE id = ?
+                ''',
+                ((worker, lease, now + self.visibility_timeout, task_id) for task_id, _ in tasks)
+            )
+            self.connection.execute('COMMIT')
+
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+
+        return [(task_id, lease, pickle.loads(task)) for task_id, task in tasks]
+
+    def complete(self: object, task_id: int, lease: str, rows: list, tasks: list) -> bool:
+
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            entry = self.connection.execute(
+                "SELECT root FROM tasks WHERE id = ? AND lease = ? AND state = 'leased'",
+                (task_id, lease)
+            ).fetchone()
+            if entry is None:
+                self.connection.execute('ROLLBACK')
+                return False
+
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?)',
+                (task_id, json.dumps(rows, ensure_ascii=False, default=str))
+            )
+            self.push(tasks, entry[0])
+            self.connection.execute(
+                "UPDATE tasks SET state = 'done', worker = NULL, lease = NULL WHERE id = ?",
+                (task_id,)
+            )
+            self.connection.execute('COMMIT')
+
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+
+        return True
+
+    def fail(self: object, task_id: int, lease: str) -> None:
+
+        self.connection.execute(
+            '''
+                UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, worker = NULL, lease = NULL
+                WHERE id = ? AND lease = ? AND state = 'leased'
+            ''',
+            (self.max_attempts, task_id, lease)
+        )
+
+    def finished(self: object) -> bool:
+
+        return self.seeded() and self.connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')"
+        ).fetchone()[0] == 0
+
+    def failed(self: object) -> int:
+
+        return self.connection.execute("SELECT COUNT(*) FROM tasks WHERE state = 'failed'").fetchone()[0]
+
+    def retry(self: object) -> None:
+
+        self.connection.execute(
+            "UPDATE tasks SET state = 'pending', attempts = 0, worker = NULL, lease = NULL WHERE state IN ('failed', 'leased')"
+        )
+
+    def results(self: object) -> object:
+
+        for (rows,) in self.connection.execute(
+            'SELECT results.rows FROM results JOIN tasks ON tasks.id = results.task_id ORDER BY tasks.root, tasks.id'
+        ):
+            yield json.loads(rows)
+
+    def clear(self: object) -> None:
+
+        self.connection.executescript(
+            '''
+                BEGIN IMMEDIATE;
+                DELETE FROM tasks;
+                DELETE FROM results;
+                DELETE FROM runs;
+                COMMIT;
+            '''
+        )
+
+    def close(self: object) -> None:
+
+        self.connection.close()
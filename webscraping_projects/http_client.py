@@ -0,0 +1,843 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlencode
+from cache import ResponseCache, extractor_key
+from archive import ResponseArchive, ArchiveReader, ArchivedStream, ReplayedStream, archive_key
+from transport import Http2Session, Decompressor, DecompressedStream, accept_encoding, connection_trace
+from pipeline import ParsePool
+from metrics import Metrics
+from contextlib import asynccontextmanager
+from collections import deque
+from typing import NamedTuple
+from time import monotonic, perf_counter
+import hashlib
+import aiohttp
+import asyncio
+import random
+
+DEFAULT_HEADERS: dict = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36'
+}
+
+class Response(NamedTuple):
+
+    """
+        Class that holds the status, the headers and the body of a response.
+    """
+
+    status: int
+    headers: dict
+    content: bytes
+
+class RateLimiter:
+
+    """
+        Class that limits the request rate against a host with a token bucket.
+
+        Attributes
+        ----------
+        rate: float
+            The number of tokens added to the bucket per second.
+
+        burst: int
+            The maximum number of tokens the bucket holds.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        acquire()
+            Function that waits, without blocking the event loop, until a token is available.
+    """
+
+    def __init__(
+        self: object,
+        rate: float,
+        burst: int
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.rate: float = rate
+        self.burst: int = burst
+
+        self.tokens: float = burst
+        self.updated: float = monotonic()
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    async def acquire(self: object) -> None:
+
+        """
+            Function that waits, without blocking the event loop, until a token is available.
+        """
+
+        async with self.lock:
+            while True:
+                now = monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AdaptiveLimiter:
+
+    """
+        Class that limits the requests in flight against a host, adapting the limit to how the host responds.
+
+        The limit follows AIMD, like TCP congestion control. It starts low and grows by one per successful
+        request until the first sign of congestion, and by about one per round of requests after it. A 429
+        or 5xx response, a timeout or a dropped connection halves it, and a short-term latency much higher
+        than the long-term one lowers it by a tenth. Only one decrease is made per round of requests,
+        since the requests already in flight when the host became congested report the same congestion.
+        The limit only grows while it is fully used.
+
+        The limiter bounds the requests in flight, while the token bucket of the client, when it has a rate
+        limit, bounds the requests sent per second, and a request waits for its token before it takes a slot.
+        So, by Little's law, the limit is only reached, and grows, while the rate limit times the latency of
+        the host exceeds it; below that, the rate limit is the bound and the limit stays where it is.
+
+        Attributes
+        ----------
+        max_limit: int
+            The maximum number of requests in flight.
+
+        min_limit: int
+            The minimum number of requests in flight.
+
+        limit: float
+            The current limit, rounded down to get the number of requests allowed in flight.
+
+        adaptive: bool
+            Whether the limit adapts, or stays at "max_limit".
+
+        latency_tolerance: float
+            How many times the long-term latency the short-term latency may reach before the limit is lowered.
+
+        on_change: object | None
+            The function called with the limit when it changes.
+
+        in_flight: int
+            The number of requests in flight.
+
+        waiters: collections.deque
+            The futures of the requests waiting for a slot.
+
+        slow_start: bool
+            Whether the limit still grows by one per successful request.
+
+        decreased_at: float
+            The time of the last decrease, before which the congested requests were sent.
+
+        short_latency: float | None
+            The short-term moving average of the latency.
+
+        long_latency: float | None
+            The long-term moving average of the latency.
+
+        samples: int
+            The number of latencies in the moving averages.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        acquire()
+            Function that waits, without blocking the event loop, until a request may be sent.
+
+        wake()
+            Function that hands the free slots to the requests waiting for them.
+
+        decrease()
+            Function that lowers the limit, once per round of requests.
+
+        release()
+            Function that frees the slot of a request and adapts the limit to its outcome.
+
+        slot()
+            Function that holds a slot while a request is sent, adapting the limit to its outcome.
+    """
+
+    def __init__(
+        self: object,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int = 10,
+        adaptive: bool = True,
+        latency_tolerance: float = 2.0,
+        on_change: object | None = None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.max_limit: int = max(1, max_limit)
+        self.min_limit: int = max(1, min(min_limit, self.max_limit))
+        self.limit: float = float(max(self.min_limit, min(initial_limit, self.max_limit)) if adaptive else self.max_limit)
+
+        self.adaptive: bool = adaptive
+        self.latency_tolerance: float = latency_tolerance
+        self.on_change: object | None = on_change
+
+        self.in_flight: int = 0
+        self.waiters: deque = deque()
+
+        self.slow_start: bool = True
+        self.decreased_at: float = 0.0
+
+        self.short_latency: float | None = None
+        self.long_latency: float | None = None
+        self.samples: int = 0
+
+        if self.on_change is not None:
+            self.on_change(self.limit)
+
+    async def acquire(self: object) -> float:
+
+        """
+            Function that waits, without blocking the event loop, until a request may be sent.
+
+            Returns the time the slot was taken, to be given back to "release".
+        """
+
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            return monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self.wake()
+            else:
+                self.waiters.remove(waiter)
+            raise
+
+        return monotonic()
+
+    def wake(self: object) -> None:
+
+        """
+            Function that hands the free slots to the requests waiting for them.
+        """
+
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def decrease(self: object, started_at: float, factor: float) -> None:
+
+        """
+            Function that lowers the limit, once per round of requests.
+        """
+
+        if started_at < self.decreased_at:
+            return
+
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self.slow_start = False
+        self.decreased_at = monotonic()
+
+    def release(self: object, started_at: float, outcome: str, latency: float | None = None) -> None:
+
+        """
+            Function that frees the slot of a request and adapts the limit to its outcome.
+
+            The "outcome" is "success", "congestion", or "other" for the failures that say nothing about
+            the load of the host, such as a 404 response.
+        """
+
+        used = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+
+        if self.adaptive:
+            limit = self.limit
+
+            if outcome == 'congestion':
+                self.decrease(started_at, 0.5)
+
+            elif outcome == 'success' and latency is not None:
+                self.samples += 1
+                self.short_latency = latency if self.short_latency is None else 0.8 * self.short_latency + 0.2 * latency
+                self.long_latency = latency if self.long_latency is None else 0.98 * self.long_latency + 0.02 * latency
+
+                if self.samples >= 10 and self.short_latency > self.latency_tolerance * self.long_latency:
+                    self.decrease(started_at, 0.9)
+                elif used:
+                    self.limit = min(float(self.max_limit), self.limit + (1 if self.slow_start else 1 / self.limit))
+
+            if self.limit != limit and self.on_change is not None:
+                self.on_change(self.limit)
+
+        self.wake()
+
+    @asynccontextmanager
+    async def slot(self: object) -> object:
+
+        """
+            Function that holds a slot while a request is sent, adapting the limit to its outcome.
+
+            It yields a dict in which the request sets the "status" of the response and, when it succeeds,
+            its "latency". Timeouts and dropped connections, of any transport, count as congestion.
+        """
+
+        started_at = await self.acquire()
+        result = {'status': None, 'latency': None}
+        outcome = 'other'
+        try:
+            yield result
+
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError, ConnectionError):
+            outcome = 'congestion'
+            raise
+
+        finally:
+            if result['latency'] is not None:
+                outcome = 'success'
+            elif result['status'] is not None and (result['status'] == 429 or result['status'] >= 500):
+                outcome = 'congestion'
+
+            self.release(started_at, outcome, result['latency'])
+
+class HttpClient:
+
+    """
+        Class shared by all scrapers to request URLs concurrently over a single connection pool.
+
+        The bodies are asked for compressed and decompressed by the client, so the metrics record both their
+        compressed and decompressed sizes, and whether every request opened a connection or reused one.
+
+        Attributes
+        ----------
+        concurrency: int
+            The maximum number of connections open across all hosts.
+
+        concurrency_per_host: int
+            The number of requests in flight against the same host, or, when it adapts, around which it
+            starts: at half of it.
+
+        max_concurrency_per_host: int
+            The maximum number of requests in flight, and connections open, against the same host when it adapts,
+            four times "concurrency_per_host" by default, within "concurrency".
+
+        adaptive_concurrency: bool
+            Whether the number of requests in flight against each host adapts, between 1 and
+            "max_concurrency_per_host", to the latency and the errors of the host.
+
+        timeout: int
+            The total timeout, in seconds, of each request.
+
+        headers: dict
+            The headers sent with every request.
+
+        attempts: int
+            The number of attempts made before a request is considered failed.
+
+        backoff: float
+            The base delay, in seconds, of the exponential backoff between attempts.
+
+        max_backoff: float
+            The maximum delay, in seconds, between attempts.
+
+        max_retry_after: float
+            The maximum delay, in seconds, asked for by a "Retry-After" header that is waited for.
+
+        rate_limit: float | None
+            The maximum number of requests per second against the same host, or None for no limit.
+
+        burst: int
+            The number of requests that may be sent at once against the same host before the rate limit applies.
+
+        http2: bool
+            Whether the requests are sent over HTTP/2 with httpx, multiplexed over one connection per host,
+            instead of over HTTP/1.1 with aiohttp.
+
+        session: aiohttp.ClientSession | Http2Session
+            The session that holds the connection pool, opened by "async with".
+
+        rate_limiters: dict
+            A dict that stores the rate limiter of each host.
+
+        limiters: dict
+            A dict that stores the adaptive limiter of the requests in flight against each host.
+
+        cache: ResponseCache | None
+            The cache used to send conditional requests and reuse the data extracted from unchanged responses.
+
+        parse_pool: ParsePool | None
+            The pool of worker processes that runs the extraction, or None to run it in the event loop.
+
+        metrics: Metrics | None
+            The metrics that record the latency, size and retries of the requests and the extraction time.
+
+        archive: ResponseArchive | None
+            The archive the successful responses are appended to, or None to not archive them.
+
+        replay: ArchiveReader | None
+            The archive the responses are read from instead of the network, or None to send the requests.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        get()
+            Function that sends a GET request and returns its body.
+
+        post()
+            Function that sends a POST request and returns its body.
+
+        get_extracted()
+            Function that sends a GET request and returns the data extracted from its body, reusing the cache.
+
+        run_extract()
+            Function that runs an extraction in the parse pool, or directly when there is none.
+
+        host_limit()
+            Function that returns the maximum number of requests in flight against the same host.
+
+        limiter()
+            Function that returns the adaptive limiter of a host, creating it on the first request.
+
+        request()
+            Function that sends a request, retrying with exponential backoff, and returns its response.
+
+        replayed()
+            Function that returns the archived response of a request.
+
+        request_items()
+            Function that sends a request and yields the items decoded incrementally from its body.
+
+        retry_delay()
+            Function that computes how long to wait before the next attempt.
+
+        gather()
+            Function that runs several requests concurrently and returns their results in order.
+
+        stream()
+            Function that runs several requests concurrently and yields their results in order.
+    """
+
+    def __init__(
+        self: object,
+        concurrency: int = 20,
+        concurrency_per_host: int = 10,
+        max_concurrency_per_host: int | None = None,
+        adaptive_concurrency: bool = True,
+        timeout: int = 90,
+        headers: dict | None = None,
+        attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        rate_limit: float | None = 10.0,
+        burst: int = 10,
+        cache: ResponseCache | None = None,
+        parse_pool: ParsePool | None = None,
+        metrics: Metrics | None = None,
+        archive: ResponseArchive | None = None,
+        replay: ArchiveReader | None = None,
+        http2: bool = False
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.concurrency: int = concurrency
+        self.concurrency_per_host: int = concurrency_per_host
+        self.max_concurrency_per_host: int = max_concurrency_per_host or 4 * concurrency_per_host
+        self.adaptive_concurrency: bool = adaptive_concurrency
+        self.timeout: int = timeout
+        self.headers: dict = headers or DEFAULT_HEADERS
+
+        self.attempts: int = attempts
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.max_retry_after: float = max_retry_after
+
+        self.rate_limit: float | None = rate_limit
+        self.burst: int = burst
+
+        self.http2: bool = http2
+        self.session: aiohttp.ClientSession | Http2Session | None = None
+        self.rate_limiters: dict = {}
+        self.limiters: dict = {}
+
+        self.cache: ResponseCache | None = cache
+        self.parse_pool: ParsePool | None = parse_pool
+        self.metrics: Metrics | None = metrics
+
+        self.archive: ResponseArchive | None = archive
+        self.replay: ArchiveReader | None = replay
+
+    async def __aenter__(self: object) -> object:
+
+        headers = {'Accept-Encoding': accept_encoding(), **self.headers}
+        on_connection = self.metrics.record_connection if self.metrics is not None else None
+
+        if self.http2:
+            self.session = Http2Session(self.concurrency, self.timeout, headers, on_connection)
+            return self
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.host_limit,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=headers,
+            auto_decompress=False,
+            trace_configs=[connection_trace(on_connection)] if on_connection is not None else None
+        )
+
+        return self
+
+    async def __aexit__(self: object, *exc_info) -> None:
+
+        await self.session.close()
+        self.session = None
+
+    async def get(self: object, url: str, description: str, **kwargs) -> bytes:
+
+        """
+            Function that sends a GET request and returns its body.
+        """
+
+        return (await self.request('GET', url, description, **kwargs)).content
+
+    async def post(self: object, url: str, description: str, **kwargs) -> bytes:
+
+        """
+            Function that sends a POST request and returns its body.
+        """
+
+        return (await self.request('POST', url, description, **kwargs)).content
+
+    async def get_extracted(self: object, url: str, description: str, extract: object, **kwargs) -> object:
+
+        """
+            Function that sends a GET request and returns the data extracted from its body, reusing the cache.
+
+            The "extract" function receives the body and returns JSON serializable data. When a cached
+            entry exists, the request is conditional, and a 304 response or a body with the same hash
+            returns the cached data without calling "extract" again. The entries are keyed by the URL and the
+            extractor, so the data of another extractor of the same URL, or of an older version, is never returned.
+            While the responses are archived, the request is never conditional, so every body is archived for a replay.
+        """
+
+        if self.cache is None:
+            return await self.run_extract(extract, await self.get(url, description, **kwargs))
+
+        key = url + ('?' + urlencode(kwargs['params']) if kwargs.get('params') else '') + ' ' + extractor_key(extract)
+        entry = self.cache.get(key)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None and self.archive is None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = await self.request('GET', url, description, headers=headers, **kwargs)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        content_hash = hashlib.sha256(response.content).hexdigest() if response.status != 304 else None
+        if entry is not None and (response.status == 304 or entry['content_hash'] == content_hash):
+            self.cache.touch(key, etag, last_modified)
+            if self.metrics is not None:
+                self.metrics.record_cache(True)
+            return entry['value']
+
+        if self.metrics is not None:
+            self.metrics.record_cache(False)
+
+        value = await self.run_extract(extract, response.content)
+        self.cache.put(key, etag, last_modified, content_hash, value)
+        return value
+
+    async def run_extract(self: object, extract: object, content: bytes) -> object:
+
+        """
+            Function that runs an extraction in the parse pool, or directly when there is none.
+
+            With a parse pool, the recorded extraction time includes the time waiting for a worker.
+        """
+
+        started_at = perf_counter()
+        if self.parse_pool is None:
+            value = extract(content)
+        else:
+            value = await self.parse_pool.extract(extract, content)
+
+        if self.metrics is not None:
+            self.metrics.record_parse(perf_counter() - started_at)
+
+        return value
+
+    @property
+    def host_limit(self: object) -> int:
+
+        """
+            Function that returns the maximum number of requests in flight against the same host.
+        """
+
+        return min(self.concurrency, self.max_concurrency_per_host if self.adaptive_concurrency else self.concurrency_per_host)
+
+    def limiter(self: object, host: str) -> AdaptiveLimiter:
+
+        """
+            Function that returns the adaptive limiter of a host, creating it on the first request.
+
+            When it adapts, its limit starts at half of "concurrency_per_host" and grows up to "host_limit".
+            Its limit is recorded in the "concurrency_limit" gauge of the metrics.
+        """
+
+        if host not in self.limiters:
+            self.limiters[host] = AdaptiveLimiter(
+                self.host_limit,
+                initial_limit=max(1, self.concurrency_per_host // 2),
+                adaptive=self.adaptive_concurrency,
+                on_change=(lambda limit: self.metrics.set_gauge('concurrency_limit', int(limit), host=host)) if self.metrics is not None else None
+            )
+
+        return self.limiters[host]
+
+    async def request(self: object, method: str, url: str, description: str, **kwargs) -> Response:
+
+        """
+            Function that sends a request, retrying with exponential backoff, and returns its response.
+
+            Only 200 responses, and 304 responses to conditional requests, are considered successful.
+
+            The "description" is only used to compose the log and error messages.
+            With "replay", the response is read from the archive instead, and with "archive", the 200 responses
+            are appended to it.
+        """
+
+        if self.replay is not None:
+            return self.replayed(method, url, **kwargs)
+
+        host = urlsplit(url).netloc
+        if self.rate_limit and host not in self.rate_limiters:
+            self.rate_limiters[host] = RateLimiter(self.rate_limit, self.burst)
+
+        conditional = any(header in (kwargs.get('headers') or {}) for header in ('If-None-Match', 'If-Modified-Since'))
+
+        attempts = 0
+        while True:
+            if attempts == self.attempts:
+                raise Exception(
+                    f'After {self.attempts} failed attempts, it was not possible to collect {description}.'
+                )
+
+            retry_after = None
+            try:
+                if self.rate_limit:
+                    await self.rate_limiters[host].acquire()
+
+                async with self.limiter(host).slot() as result:
+                    started_at = perf_counter()
+                    async with self.session.request(method, url, **kwargs) as response:
+                        result['status'] = response.status
+                        if response.status == 200 or (response.status == 304 and conditional):
+                            decompressor = Decompressor(response.headers.get('Content-Encoding'))
+                            content = decompressor.decompress(await response.read()) + decompressor.flush()
+                            result['latency'] = perf_counter() - started_at
+                            if self.metrics is not None:
+                                self.metrics.record_request(host, result['latency'], decompressor.decompressed, decompressor.compressed)
+                            if self.archive is not None and response.status == 200:
+                                self.archive.put(
+                                    archive_key(method, url, kwargs.get('params'), kwargs.get('data')),
+                                    url, response.status, response.headers, content
+                                )
+                            return Response(response.status, response.headers, content)
+
+                        retry_after = response.headers.get('Retry-After')
+
+                print(f'Attempt {attempts} to collect {description} failed. Response: {response.status}. Trying again...')
+
+            except Exception as e:
+                print(f'Attempt {attempts} to collect {description} failed. Error: {e}. Trying again...')
+
+            if self.metrics is not None:
+                self.metrics.record_retry(host)
+
+            attempts += 1
+            if attempts < self.attempts:
+                await asyncio.sleep(self.retry_delay(attempts, retry_after))
+
+    async def request_items(
+        self: object,
+        method: str,
+        url: str,
+        description: str,
+        decode: object,
+        archived: bool = True,
+        **kwargs
+    ) -> object:
+
+        """
+            Function that sends a request and yields the items decoded incrementally from its body.
+
+            The "decode" function receives the body stream and returns an async iterator of items, so the
+            body is never held in memory as a whole. A request is only retried while no item has been
+            yielded yet, since the items already yielded cannot be taken back.
+            With "replay", the body is read from the archive instead, and with "archive", the body is
+            compressed into its record while it is decoded, unless "archived" is off.
+        """
+
+        if self.replay is not None:
+            async for item in decode(ReplayedStream(self.replayed(method, url, **kwargs).content)):
+                yield item
+            return
+
+        key = archive_key(method, url, kwargs.get('params'), kwargs.get('data'))
+
+        host = urlsplit(url).netloc
+        if self.rate_limit and host not in self.rate_limiters:
+            self.rate_limiters[host] = RateLimiter(self.rate_limit, self.burst)
+
+        attempts = 0
+        while True:
+            if attempts == self.attempts:
+                raise Exception(
+                    f'After {self.attempts} failed attempts, it was not possible to collect {description}.'
+                )
+
+            retry_after = None
+            items = 0
+            try:
+                if self.rate_limit:
+                    await self.rate_limiters[host].acquire()
+
+                async with self.limiter(host).slot() as result:
+                    started_at = perf_counter()
+                    async with self.session.request(method, url, **kwargs) as response:
+                        result['status'] = response.status
+                        if response.status == 200:
+                            record = None
+                            decompressor = Decompressor(response.headers.get('Content-Encoding'))
+                            stream = DecompressedStream(response.content, decompressor)
+                            if self.archive is not None and archived:
+                                record = self.archive.record(key, url, response.status, response.headers)
+                                stream = ArchivedStream(stream, record)
+
+                            async for item in decode(stream):
+                                items += 1
+                                yield item
+
+                            if record is not None:
+                                self.archive.append(record)
+
+                            result['latency'] = perf_counter() - started_at
+                            if self.metrics is not None:
+                                self.metrics.record_request(host, result['latency'], decompressor.decompressed, decompressor.compressed)
+                            return
+
+                        retry_after = response.headers.get('Retry-After')
+
+                print(f'Attempt {attempts} to collect {description} failed. Response: {response.status}. Trying again...')
+
+            except Exception as e:
+                if items:
+                    raise
+
+                print(f'Attempt {attempts} to collect {description} failed. Error: {e}. Trying again...')
+
+            if self.metrics is not None:
+                self.metrics.record_retry(host)
+
+            attempts += 1
+            if attempts < self.attempts:
+                await asyncio.sleep(self.retry_delay(attempts, retry_after))
+
+    def replayed(self: object, method: str, url: str, **kwargs) -> Response:
+
+        """
+            Function that returns the archived response of a request.
+        """
+
+        metadata, content = self.replay.get(archive_key(method, url, kwargs.get('params'), kwargs.get('data')))
+        if self.metrics is not None:
+            self.metrics.record_request(urlsplit(url).netloc, 0.0, len(content))
+
+        return Response(metadata['status'], metadata['headers'], content)
+
+    def retry_delay(self: object, attempts: int, retry_after: str | None = None) -> float:
+
+        """
+            Function that computes how long to wait before the next attempt.
+
+            The "Retry-After" header, in seconds or as an HTTP date, takes precedence, up to "max_retry_after",
+            so a server that asks for a long wait does not stall the worker. Otherwise the delay grows exponentially
+            with the attempts, with full jitter, up to "max_backoff".
+        """
+
+        if retry_after:
+            try:
+                return min(self.max_retry_after, max(0.0, float(retry_after)))
+
+            except ValueError:
+                try:
+                    return min(self.max_retry_after, max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()))
+
+                except (TypeError, ValueError):
+                    pass
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempts))
+
+    @staticmethod
+    async def gather(*coroutines) -> list:
+
+        """
+            Function that runs several requests concurrently and returns their results in order.
+
+            If any request fails, the ones still pending are cancelled before the error is raised.
+        """
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    async def stream(*coroutines) -> object:
+
+        """
+            Function that runs several requests concurrently and yields their results in order.
+
+            Each result is yielded as soon as it and all the ones before it are done, so they can be
+            consumed while the remaining requests are still running. If any request fails, or the
+            consumer stops early, the ones still pending are cancelled.
+        """
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            for task in tasks:
+                yield await task
+
+        finally:
+            for task in tasks:
+                task.cancel()
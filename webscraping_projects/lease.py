@@ -0,0 +1,241 @@
+from time import time
+import asyncio
+import socket
+import uuid
+import os
+
+class Lease:
+
+    """
+        Class that makes sure only one run of a scraper writes its reports at a time, across processes.
+
+        The lease is a lock file created atomically, holding the host, the process id and the token of the run
+        that took it. The run renews it while it goes on, so a lease whose process is dead, on this host, or
+        that was not renewed for "timeout" seconds, by a run on another host, is considered abandoned and is
+        taken over. Taking a lease over and giving it back first move the lock file aside with an atomic rename,
+        and only go on when it is the one expected, so two runs never hold the lease at once, and a run never
+        removes a lease taken over by another one.
+
+        Attributes
+        ----------
+        path: str
+            The path of the lock file.
+
+        timeout: float
+            The time, in seconds, after which a lease not renewed is considered abandoned.
+
+        token: str
+            The token that tells the lock file of this run from the ones of other runs.
+
+        acquired: bool
+            Whether this process holds the lease.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        holder()
+            Function that returns the host, the process id and the token written in a lock file.
+
+        abandoned()
+            Function that returns whether the run holding a lock file is gone.
+
+        claim()
+            Function that moves a lock file aside, only if it holds the given token.
+
+        acquire()
+            Function that takes the lease, returning False if another run holds it.
+
+        renew()
+            Function that marks the lease as still held, returning False if it was taken over.
+
+        keep()
+            Function that renews the lease until it is cancelled.
+
+        release()
+            Function that gives the lease back, unless it was taken over.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        timeout: float = 15 * 60
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.path: str = path
+        self.timeout: float = timeout
+
+        self.token: str = uuid.uuid4().hex
+        self.acquired: bool = False
+
+    def __enter__(self: object) -> object:
+
+        self.acquire()
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.release()
+
+    @staticmethod
+    def holder(path: str) -> tuple | None:
+
+        """
+            Function that returns the host, the process id and the token written in a lock file, or None if it is gone.
+
+            A lock file written by an older version holds no host or token, which are then None.
+        """
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                fields = file.read().split()
+
+        except FileNotFoundError:
+            return None
+
+        if len(fields) == 4:
+            return fields[0], int(fields[1]), fields[2]
+
+        return None, int(fields[0]) if fields and fields[0].isdigit() else None, None
+
+    def abandoned(self: object, holder: tuple) -> bool:
+
+        """
+            Function that returns whether the run holding a lock file is gone.
+
+            The process of a run on this host is checked directly, a killed process not reaped yet counting as
+            gone, while a run on another host is only known to be gone once its lease was not renewed for "timeout"
+            seconds.
+        """
+
+        try:
+            if time() - os.path.getmtime(self.path) > self.timeout:
+                return True
+
+        except FileNotFoundError:
+            return True
+
+        host, pid, _ = holder
+        if host != socket.gethostname() or pid is None or os.name == 'nt':
+            return False
+
+        try:
+            os.kill(pid, 0)
+
+        except ProcessLookupError:
+            return True
+
+        except PermissionError:
+            return False
+
+        try:
+            with open(f'/proc/{pid}/stat', encoding='utf-8') as file:
+                return file.read().rsplit(')', 1)[1].split()[0] == 'Z'
+
+        except (OSError, IndexError):
+            return False
+
+    def claim(self: object, token: str | None) -> bool:
+
+        """
+            Function that moves the lock file aside, only if it holds the given token, returning whether it did.
+
+            The rename is atomic, so only one run claims a lock file. A lock file claimed by mistake, as it was
+            replaced in the meantime, is put back.
+        """
+
+        claimed = f'{self.path}.{self.token}.claimed'
+        try:
+            os.rename(self.path, claimed)
+
+        except FileNotFoundError:
+            return False
+
+        holder = self.holder(claimed)
+        if holder is not None and holder[2] != token:
+            try:
+                os.link(claimed, self.path)
+
+            except FileExistsError:
+                pass
+
+            os.remove(claimed)
+            return False
+
+        os.remove(claimed)
+        return True
+
+    def acquire(self: object) -> bool:
+
+        """
+            Function that takes the lease, returning False if another run holds it.
+
+            The lock file is written whole before it is linked to its path, so no run ever reads it half written.
+        """
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        written = f'{self.path}.{self.token}.new'
+        with open(written, 'w', encoding='utf-8') as file:
+            file.write(f'{socket.gethostname()} {os.getpid()} {self.token} {time()}')
+
+        try:
+            for _ in range(3):
+                try:
+                    os.link(written, self.path)
+                    self.acquired = True
+                    return True
+
+                except FileExistsError:
+                    holder = self.holder(self.path)
+                    if holder is not None and not self.abandoned(holder):
+                        return False
+
+                    if holder is not None:
+                        print(f'Taking over the lease "{self.path}", abandoned by the process {holder[1]}.')
+                        self.claim(holder[2])
+
+            return False
+
+        finally:
+            os.remove(written)
+
+    def renew(self: object) -> bool:
+
+        """
+            Function that marks the lease as still held, returning False if it was taken over.
+        """
+
+        holder = self.holder(self.path)
+        if holder is None or holder[2] != self.token:
+            self.acquired = False
+            return False
+
+        os.utime(self.path)
+        return True
+
+    async def keep(self: object) -> None:
+
+        """
+            Function that renews the lease, every third of its "timeout", until it is cancelled.
+        """
+
+        while self.acquired:
+            await asyncio.sleep(self.timeout / 3)
+            if not self.renew():
+                print(f'The lease "{self.path}" was taken over by another run.')
+
+    def release(self: object) -> None:
+
+        """
+            Function that gives the lease back, unless it was taken over.
+        """
+
+        if self.acquired:
+            self.claim(self.token)
+            self.acquired = False
@@ -0,0 +1,360 @@
+from contextlib import contextmanager
+from collections import defaultdict
+from time import time
+import json
+import os
+
+class Metrics:
+
+    """
+        Class that records the performance of a scraping run.
+
+        Attributes
+        ----------
+        name: str
+            The name of the run, used as the "scraper" label of the exported metrics.
+
+        started_at: float
+            The time the run started.
+
+        finished_at: float | None
+            The time the run finished, or None while it is running.
+
+        latencies: dict
+            A dict that stores, per host, the latency in seconds of every successful request.
+
+        bytes: dict
+            A dict that stores, per host, the number of bytes downloaded, once decompressed.
+
+        compressed_bytes: dict
+            A dict that stores, per host, the number of bytes downloaded, as received.
+
+        connections: dict
+            A dict that stores, per host, the number of requests that opened a new connection and that reused one.
+
+        retries: dict
+            A dict that stores, per host, the number of failed attempts that were retried or gave up.
+
+        cache: dict
+            A dict that stores the number of cache hits and misses.
+
+        parse_times: list
+            A list that stores the time in seconds spent extracting each page.
+
+        sinks: dict
+            A dict that stores, per sink, the number of rows written and the time spent writing them.
+
+        gauges: dict
+            A dict that stores the last value of each gauge, keyed by its name and labels.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        record_request()
+            Function that records a successful request.
+
+        record_retry()
+            Function that records a failed attempt.
+
+        record_connection()
+            Function that records whether a request opened a new connection or reused one.
+
+        record_cache()
+            Function that records a cache hit or miss.
+
+        record_parse()
+            Function that records the time spent extracting a page.
+
+        record_sink()
+            Function that records the rows written by a sink and the time spent writing them.
+
+        set_gauge()
+            Function that records the current value of a gauge.
+
+        finish()
+            Function that marks the run as finished.
+
+        percentile()
+            Function that returns the percentile of a list of values.
+
+        summary()
+            Function that returns the summary of the run as a dict.
+
+        prometheus()
+            Function that returns the metrics of the run in the Prometheus text format.
+
+        save()
+            Function that saves the summary as JSON and the metrics as a Prometheus text file.
+    """
+
+    def __init__(
+        self: object,
+        name: str
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.name: str = name
+
+        self.started_at: float = time()
+        self.finished_at: float | None = None
+
+        self.latencies: dict = defaultdict(list)
+        self.bytes: dict = defaultdict(int)
+        self.compressed_bytes: dict = defaultdict(int)
+        self.connections: dict = defaultdict(lambda: {'new': 0, 'reused': 0})
+        self.retries: dict = defaultdict(int)
+        self.cache: dict = {'hits': 0, 'misses': 0}
+        self.parse_times: list = []
+        self.sinks: dict = {}
+        self.gauges: dict = {}
+
+    def record_request(self: object, host: str, latency: float, size: int, compressed_size: int | None = None) -> None:
+
+        """
+            Function that records a successful request, with the size of its body decompressed and as received.
+        """
+
+        self.latencies[host].append(latency)
+        self.bytes[host] += size
+        self.compressed_bytes[host] += size if compressed_size is None else compressed_size
+
+    def record_retry(self: object, host: str) -> None:
+
+        """
+            Function that records a failed attempt.
+        """
+
+        self.retries[host] += 1
+
+    def record_connection(self: object, host: str, reused: bool) -> None:
+
+        """
+            Function that records whether a request opened a new connection or reused one.
+        """
+
+        self.connections[host]['reused' if reused else 'new'] += 1
+
+    def record_cache(self: object, hit: bool) -> None:
+
+        """
+            Function that records a cache hit or miss.
+        """
+
+        self.cache['hits' if hit else 'misses'] += 1
+
+    def record_parse(self: object, seconds: float) -> None:
+
+        """
+            Function that records the time spent extracting a page.
+        """
+
+        self.parse_times.append(seconds)
+
+    def record_sink(self: object, name: str, rows: int, seconds: float) -> None:
+
+        """
+            Function that records the rows written by a sink and the time spent writing them.
+        """
+
+        self.sinks[name] = {'rows': rows, 'write_seconds': seconds}
+
+    def set_gauge(self: object, name: str, value: float, **labels) -> None:
+
+        """
+            Function that records the current value of a gauge.
+        """
+
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def finish(self: object) -> None:
+
+        """
+            Function that marks the run as finished.
+        """
+
+        self.finished_at = time()
+
+    @staticmethod
+    def percentile(values: list, percent: float) -> float:
+
+        """
+            Function that returns the percentile of a list of values, or 0 if it is empty.
+        """
+
+        if not values:
+            return 0.0
+
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+    def summary(self: object) -> dict:
+
+        """
+            Function that returns the summary of the run as a dict.
+        """
+
+        duration = (self.finished_at or time()) - self.started_at
+        rows = sum(sink['rows'] for sink in self.sinks.values())
+
+        return {
+            'scraper': self.name,
+            'started_at': self.started_at,
+            'duration_seconds': duration,
+            'hosts': {
+                host: {
+                    'requests': len(self.latencies[host]),
+                    'bytes': self.bytes[host],
+                    'compressed_bytes': self.compressed_bytes[host],
+                    'connections_new': self.connections[host]['new'],
+                    'connections_reused': self.connections[host]['reused'],
+                    'retries': self.retries[host],
+                    'latency_mean_seconds': sum(self.latencies[host]) / len(self.latencies[host]) if self.latencies[host] else 0.0,
+                    'latency_p50_seconds': self.percentile(self.latencies[host], 50),
+                    'latency_p99_seconds': self.percentile(self.latencies[host], 99)
+                }
+                for host in sorted(set(self.latencies) | set(self.retries) | set(self.connections))
+            },
+            'cache': self.cache,
+            'parse': {
+                'pages': len(self.parse_times),
+                'total_seconds': sum(self.parse_times),
+                'mean_seconds': sum(self.parse_times) / len(self.parse_times) if self.parse_times else 0.0
+            },
+            'sinks': self.sinks,
+            'gauges': {
+                name + ''.join(f'[{key}={value}]' for key, value in labels): value
+                for (name, labels), value in self.gauges.items()
+            },
+            'rows': rows,
+            'rows_per_second': rows / duration if duration else 0.0
+        }
+
+    def prometheus(self: object) -> str:
+
+        """
+            Function that returns the metrics of the run in the Prometheus text exposition format.
+
+            Every metric has its "HELP" and "TYPE" lines, the gauges recorded during the run included, and the
+            latency summary has its "_sum" and "_count" series besides its quantiles.
+        """
+
+        def labels(**values) -> str:
+
+            escaped = {
+                key: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                for key, value in {'scraper': self.name, **values}.items()
+            }
+            return '{' + ','.join(f'{key}="{value}"' for key, value in escaped.items()) + '}'
+
+        def family(name: str, kind: str, description: str, samples: object) -> list:
+
+            return [f'# HELP {name} {description}', f'# TYPE {name} {kind}', *samples]
+
+        summary = self.summary()
+        hosts = summary['hosts']
+        lines = [
+            *family('scraper_duration_seconds', 'gauge', 'The duration of the run.', [f'scraper_duration_seconds{labels()} {summary["duration_seconds"]}']),
+            *family('scraper_requests_total', 'counter', 'The requests sent.', (f'scraper_requests_total{labels(host=host)} {values["requests"]}' for host, values in hosts.items())),
+            *family('scraper_bytes_total', 'counter', 'The bytes received, decompressed.', (f'scraper_bytes_total{labels(host=host)} {values["bytes"]}' for host, values in hosts.items())),
+            *family('scraper_compressed_bytes_total', 'counter', 'The bytes received, as sent on the wire.', (f'scraper_compressed_bytes_total{labels(host=host)} {values["compressed_bytes"]}' for host, values in hosts.items())),
+            *family(
+                'scraper_connections_total', 'counter', 'The requests that opened a new connection or reused one.',
+                (
+                    f'scraper_connections_total{labels(host=host, connection=connection)} {values["connections_" + connection]}'
+                    for host, values in hosts.items() for connection in ('new', 'reused')
+                )
+            ),
+            *family('scraper_retries_total', 'counter', 'The requests retried.', (f'scraper_retries_total{labels(host=host)} {values["retries"]}' for host, values in hosts.items())),
+            *family(
+                'scraper_request_latency_seconds', 'summary', 'The latency of the requests.',
+                (
+                    sample
+                    for host, latencies in sorted(self.latencies.items())
+                    for sample in (
+                        *(
+                            f'scraper_request_latency_seconds{labels(host=host, quantile=quantile)} {self.percentile(latencies, float(quantile) * 100)}'
+                            for quantile in ('0.5', '0.99')
+                        ),
+                        f'scraper_request_latency_seconds_sum{labels(host=host)} {sum(latencies)}',
+                        f'scraper_request_latency_seconds_count{labels(host=host)} {len(latencies)}'
+                    )
+                )
+            ),
+            *family('scraper_cache_total', 'counter', 'The cache hits and misses.', (f'scraper_cache_total{labels(result=result)} {count}' for result, count in self.cache.items())),
+            *family('scraper_parse_seconds_total', 'counter', 'The time spent parsing the pages.', [f'scraper_parse_seconds_total{labels()} {summary["parse"]["total_seconds"]}']),
+            *family('scraper_parsed_pages_total', 'counter', 'The pages parsed.', [f'scraper_parsed_pages_total{labels()} {summary["parse"]["pages"]}']),
+            *family('scraper_rows_total', 'counter', 'The rows written.', (f'scraper_rows_total{labels(sink=sink)} {values["rows"]}' for sink, values in self.sinks.items())),
+            *family('scraper_sink_write_seconds_total', 'counter', 'The time spent writing the rows.', (f'scraper_sink_write_seconds_total{labels(sink=sink)} {values["write_seconds"]}' for sink, values in self.sinks.items())),
+            *family('scraper_rows_per_second', 'gauge', 'The rows written per second of the run.', [f'scraper_rows_per_second{labels()} {summary["rows_per_second"]}'])
+        ]
+
+        gauges = defaultdict(list)
+        for (name, gauge_labels), value in self.gauges.items():
+            gauges[name].append(f'scraper_{name}{labels(**dict(gauge_labels))} {value}')
+
+        for name, samples in gauges.items():
+            lines.extend(family(f'scraper_{name}', 'gauge', f'The last {name.replace("_", " ")} recorded.', samples))
+
+        return '\n'.join(lines) + '\n'
+
+    def save(self: object, directory: str) -> None:
+
+        """
+            Function that saves the summary as JSON and the metrics as a Prometheus text file.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, f'{self.name}_metrics.json'), 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, indent=4)
+
+        with open(os.path.join(directory, f'{self.name}_metrics.prom'), 'w', encoding='utf-8') as file:
+            file.write(self.prometheus())
+
+@contextmanager
+def profiled(profiler: str | None, path: str) -> object:
+
+    """
+        Function that profiles the code run inside it and saves the result in "path".
+
+        The "profiler" is "cprofile", "pyinstrument" or None to disable the profiling.
+    """
+
+    if not profiler:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if profiler == 'cprofile':
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(path + '.prof')
+
+    elif profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profile = Profiler(async_mode='enabled')
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            with open(path + '.html', 'w', encoding='utf-8') as file:
+                file.write(profile.output_html())
+
+    else:
+        raise Exception(
+            f'The profiler {profiler} is not supported. Use "cprofile" or "pyinstrument".'
+        )
@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import os
+
+class ParsePool:
+
+    """
+        Class that parses the fetched bodies in a pool of worker processes.
+
+        The bodies are put in a bounded queue and taken by one dispatcher per worker, which runs the
+        extraction in the process pool and returns the result to whoever put the body. When the queue is
+        full, "extract" waits, so the fetching slows down to the pace of the parsing instead of piling
+        bodies up in memory.
+
+        Attributes
+        ----------
+        workers: int
+            The number of worker processes.
+
+        max_pending: int
+            The maximum number of bodies waiting in the queue.
+
+        executor: ProcessPoolExecutor
+            The pool of worker processes, opened by "async with".
+
+        queue: asyncio.Queue
+            The bounded queue of bodies waiting to be parsed.
+
+        dispatchers: list
+            A list that stores the tasks that take the bodies from the queue.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        extract()
+            Function that queues a body and returns the data extracted from it by a worker.
+
+        dispatch()
+            Function that takes the bodies from the queue and parses them in the process pool.
+    """
+
+    def __init__(
+        self: object,
+        workers: int | None = None,
+        max_pending: int | None = None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.workers: int = workers or os.cpu_count() or 1
+        self.max_pending: int = max_pending or self.workers * 2
+
+        self.executor: ProcessPoolExecutor | None = None
+        self.queue: asyncio.Queue | None = None
+        self.dispatchers: list = []
+
+    async def __aenter__(self: object) -> object:
+
+        self.executor = ProcessPoolExecutor(self.workers)
+        self.queue = asyncio.Queue(self.max_pending)
+        self.dispatchers = [asyncio.ensure_future(self.dispatch()) for _ in range(self.workers)]
+
+        return self
+
+    async def __aexit__(self: object, *exc_info) -> None:
+
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+
+        self.executor.shutdown(cancel_futures=True)
+        self.executor = None
+
+    async def extract(self: object, extract: object, content: bytes) -> object:
+
+        """
+            Function that queues a body and returns the data extracted from it by a worker.
+
+            The "extract" function must be picklable, such as a module level function or a partial of one.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((extract, content, future))
+        return await future
+
+    async def dispatch(self: object) -> None:
+
+        """
+            Function that takes the bodies from the queue and parses them in the process pool.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            extract, content, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.executor, extract, content)
+
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+            finally:
+                self.queue.task_done()
@@ -1,170 +1,90 @@
-from datetime import datetime, timedelta
-from time import sleep, time
-from colorama import Fore
-import pandas as pd
-import requests
-import aiocron
-import asyncio
-import json
+from scheduler import schedule
 import sys
+
+if __name__ == '__main__' and '--once' not in sys.argv:
+    schedule(__file__, '--once', offset=int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    sys.exit()
+
+from framework import Scraper, Page, run_scraper
+from extractors import iterate_products
+from http_client import HttpClient
+from functools import partial
+import asyncio
 import os
 
 import warnings
 
 warnings.simplefilter('ignore')
 
-class AgriculturalProductsScraping:
+class AgriculturalProductsScraping(Scraper):
 
     """
-        Class that scrapes all the films from IMDb.
+        Class that scrapes all the agricultural products from agrolink.
+
+        The only seed is the list of products, decoded while it is received and written straight to the sink.
 
         Attributes
         ----------
-        session: requests.Session
-            A request session object used to store cookies and request history.
-
-        URL: str
-            The URL of the website to scrape.
-
-        products: list
-            A list that stores all scraped products.
+        fields: tuple | None
+            The fields of each product written to the sink, or None to write all of them.
 
         Methods
         -------
         __init__()
             Constructor that initializes the necessary variables.
 
-        start()
-            Function responsible for controlling the scraping process.
-
-        scraping_products()
-            Function that collects all products.
+        seeds()
+            Function that returns the list of products.
     """
 
-    session: requests.Session = requests.Session()
-    session.headers.update(
-        {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36'
-        }
-    )
+    name: str = 'agricultural_products_scraping'
+    URL: str = 'https://www.agrolink.com.br'
+    keys: tuple = ('IdProduto',)
+    categorical: tuple = ('Empresa', 'Classe', 'IngredienteAtivo')
+    sheet_name: str = 'agricultural_products_scraping'
+    cached: bool = False
 
     def __init__(
-        self: object
+        self: object,
+        *args,
+        fields: tuple | None = None,
+        **kwargs
     ) -> None:
 
         """
             Constructor that initializes the necessary variables.
         """
 
-        self.URL: str = 'https://www.agrolink.com.br'
+        super().__init__(*args, **kwargs)
 
-        self.products: list = []
+        self.fields: tuple | None = fields
 
-    def start(self: object) -> None:
+    async def seeds(self: object, client: HttpClient) -> list:
 
         """
-            Function responsible for controlling the scraping process.
+            Function that returns the list of products.
         """
 
-        self.scraping_products()
-
-    def scraping_products(self: object) -> None:
-
-        """
-            Function that collects all products.
-        """
-
-        attempts = 0
-        while True:
-            if attempts == 3:
-                raise Exception(
-                    'After 3 failed attempts, it was not possible to collect the products.'
-                )
-
-            try:
-                response = self.session.post(
-                    url=self.URL + '/agrolinkfito/ListaProdutosBusca',
-                    timeout=90
-                )
-
-                if response.status_code == 200:
-                    response = json.loads(response.content)
-                    [self.products.append(product) for product in response['ViewModel']['produtos']]
-                    break
-                else:
-                    print(f'Attempt {attempts} to collect the products failed. Response: {response}. Trying again...')
-                    attempts += 1
-                    sleep(10)
-
-            except Exception as e:
-                print(f'Attempt {attempts} to collect the products failed. Error: {e}. Trying again...')
-                attempts += 1
-                sleep(10)
-
-additional_minutes = 1 + int(sys.argv[1]) if len(sys.argv) > 1 else 1
-if datetime.now().second >= 50:
-    additional_minutes += 1
-cron = (datetime.now() + timedelta(minutes=additional_minutes)).strftime('%M %H * * *')
-print(f'This script will start at {datetime.strptime(cron, "%M %H * * *").strftime("%H:%M")}.')
+        return [
+            Page(
+                self.URL + '/agrolinkfito/ListaProdutosBusca',
+                'the products',
+                decode=partial(iterate_products, fields=self.fields),
+                method='POST'
+            )
+        ]
 
-@aiocron.crontab(cron, start=True)
-async def start_scraping_agricultural_products_initial():
+product_fields = tuple(dict.fromkeys(('IdProduto', *os.environ['PRODUCT_FIELDS'].split(',')))) if os.environ.get('PRODUCT_FIELDS') else None
 
-    init_time = time()
+async def scrape_agricultural_products(client: HttpClient | None = None) -> None:
 
-    try:
-        bot = AgriculturalProductsScraping()
-
-        bot.start()
-
-    except Exception as e:
-        print(f'Fail of the scraping process. Error: {e}.')
-
-    else:
-        print(f'Scraping process successfully completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
-
-    finally:
-        directory_report = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'agricultural_products_scraping')
-        os.makedirs(directory_report, exist_ok=True)
-
-        print(f'Saving the collected data in an excel report in the {Fore.GREEN}"{directory_report}"{Fore.RESET} directory.')
-        with pd.ExcelWriter(os.path.join(directory_report, 'agricultural_products_scraping.xlsx')) as writer:
-            dataframe = pd.DataFrame(bot.products)
-            dataframe['created_at'] = datetime.now()
-            dataframe.to_excel(writer, index=False, sheet_name='agricultural_products_scraping')
-
-        start_scraping_agricultural_products_initial.stop()
-
-@aiocron.crontab('0 8 * * *', start=True)
-async def start_scraping_agricultural_products_recursively():
-
-    init_time = time()
-
-    try:
-        bot = AgriculturalProductsScraping()
-
-        bot.start()
-
-    except Exception as e:
-        print(f'Fail of the scraping process. Error: {e}.')
-
-    else:
-        print(f'Scraping process successfully completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
-
-    finally:
-        directory_report = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'agricultural_products_scraping')
-        os.makedirs(directory_report, exist_ok=True)
-
-        print(f'Saving the collected data in an excel report in the {Fore.GREEN}"{directory_report}"{Fore.RESET} directory.')
-        with pd.ExcelWriter(os.path.join(directory_report, 'agricultural_products_scraping.xlsx')) as writer:
-            dataframe = pd.DataFrame(bot.products)
-            dataframe['created_at'] = datetime.now()
-            dataframe.to_excel(writer, index=False, sheet_name='agricultural_products_scraping')
+    """
+        Function that runs the scraping process of the agricultural products and saves the report.
 
-loop = asyncio.get_event_loop()
+        When a "client" is given, it is shared with other scrapers and its metrics are used.
+    """
 
-try:
-    loop.run_forever()
+    await run_scraper(AgriculturalProductsScraping, client, fields=product_fields)
 
-except Exception:
-    loop.close()
+if __name__ == '__main__':
+    asyncio.run(scrape_agricultural_products())
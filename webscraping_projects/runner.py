@@ -0,0 +1,141 @@
+from scheduler import Job, run_worker, policies, overlap_policy
+from contextlib import AsyncExitStack
+from functools import partial
+from colorama import Fore
+from time import time
+import importlib
+import argparse
+import aiocron
+import asyncio
+import sys
+import os
+
+scrapers: dict = {
+    'books_scraping': ('books_scraping', 'scrape_books'),
+    'films_scraping': ('films_scraping', 'scrape_films'),
+    'agricultural_products_scraping': ('products_scraping', 'scrape_agricultural_products')
+}
+
+async def run_scrapers(
+    names: list,
+    concurrency: int = 30,
+    concurrency_per_host: int = 10,
+    parse_workers: int = 0,
+    archive: bool = False,
+    replay: bool = False,
+    replay_run: str | None = None,
+    http2: bool = False
+) -> None:
+
+    """
+        Function that runs the given scrapers concurrently, sharing one client.
+
+        The scrapers share the connection pool, the rate limiters, the response cache, the parse pool and
+        the metrics, so "concurrency" is the budget of connections of all of them together.
+        With "archive", the responses are archived, and with "replay", they are read from the archives
+        instead of the network, from the run "replay_run" only, when given. With "http2", the requests are sent over HTTP/2.
+        The HTTP client, the parsers and the scrapers are only imported here, when the scrapers run.
+    """
+
+    from http_client import HttpClient
+    from archive import ResponseArchive, ArchiveReader
+    from cache import ResponseCache
+    from metrics import Metrics, profiled
+    from pipeline import ParsePool
+
+    init_time = time()
+
+    directory_report = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'runner')
+    metrics = Metrics('runner')
+
+    directory_archive = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'archive', 'runner')
+
+    async with AsyncExitStack() as stack:
+        cache = stack.enter_context(
+            ResponseCache(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TMP', 'cache', 'runner.sqlite'))
+        ) if not replay else None
+        response_archive = stack.enter_context(ResponseArchive(directory_archive)) if archive and not replay else None
+        reader = stack.enter_context(ArchiveReader(directory_archive, replay_run)) if replay else None
+        parse_pool = await stack.enter_async_context(ParsePool(parse_workers)) if parse_workers else None
+        client = await stack.enter_async_context(
+            HttpClient(
+                concurrency=concurrency,
+                concurrency_per_host=concurrency_per_host,
+                cache=cache,
+                parse_pool=parse_pool,
+                metrics=metrics,
+                archive=response_archive,
+                replay=reader,
+                http2=http2
+            )
+        )
+
+        print(f'Starting {len(names)} scrapers: {", ".join(names)}.')
+        with profiled(os.environ.get('PROFILER'), os.path.join(directory_report, 'runner_profile')):
+            await asyncio.gather(
+                *(getattr(importlib.import_module(module), function)(client) for module, function in (scrapers[name] for name in names))
+            )
+
+    metrics.finish()
+    metrics.save(directory_report)
+
+    print(f'All scrapers completed in {Fore.GREEN}{time() - init_time}{Fore.RESET} seconds.')
+
+async def main(arguments: argparse.Namespace) -> None:
+
+    """
+        Function that runs the scrapers once and then schedules them with the cron expression.
+
+        Unless "in_process" is set, every run is a worker process started with the same arguments and
+        "--once", so this process only keeps the cron machinery in memory while it waits. A run triggered
+        while the previous one is still running follows the "overlap" policy.
+    """
+
+    if arguments.once or arguments.in_process:
+        job = partial(
+            run_scrapers,
+            names=arguments.scrapers,
+            concurrency=arguments.concurrency,
+            concurrency_per_host=arguments.concurrency_per_host,
+            parse_workers=arguments.parse_workers,
+            archive=arguments.archive,
+            replay=arguments.replay,
+            replay_run=arguments.replay_run,
+            http2=arguments.http2
+        )
+    else:
+        job = partial(run_worker, os.path.abspath(__file__), *sys.argv[1:], '--once')
+
+    job = Job(job, 'the scrapers', arguments.overlap)
+    await job()
+    if arguments.once:
+        return
+
+    print(f'The scrapers will run again at "{arguments.cron}".')
+    aiocron.crontab(arguments.cron, func=job, start=True)
+    await asyncio.Event().wait()
+
+def parse_arguments() -> argparse.Namespace:
+
+    """
+        Function that parses the command line arguments of the runner.
+    """
+
+    parser = argparse.ArgumentParser(description='Runs all scrapers in a single process.')
+    parser.add_argument('--scrapers', nargs='+', choices=list(scrapers), default=list(scrapers), help='The scrapers to run.')
+    parser.add_argument('--cron', default='0 8 * * *', help='The cron expression of the recurring runs.')
+    parser.add_argument('--once', action='store_true', help='Runs the scrapers once and exits.')
+    parser.add_argument('--overlap', choices=policies, default=overlap_policy, help='What to do with a run triggered while the previous one is still running.')
+    parser.add_argument('--in-process', action='store_true', help='Runs the scrapers in this process instead of a worker process per run.')
+    parser.add_argument('--concurrency', type=int, default=30, help='The maximum number of connections of all scrapers together.')
+    parser.add_argument('--concurrency-per-host', type=int, default=10, help='The maximum number of connections per host.')
+    parser.add_argument('--archive', action='store_true', default=os.environ.get('ARCHIVE_RESPONSES', '0') == '1', help='Archives every response.')
+    parser.add_argument('--replay', action='store_true', default=os.environ.get('REPLAY', '0') == '1', help='Reads the responses from the archives instead of the network.')
+    parser.add_argument('--replay-run', default=os.environ.get('REPLAY_RUN'), help='The run replayed, by the time it started as "YYYYmmdd_HHMMSS", instead of the latest response of every run.')
+    parser.add_argument('--http2', action='store_true', default=os.environ.get('HTTP2', '0') == '1', help='Sends the requests over HTTP/2, which needs httpx and h2.')
+    parser.add_argument('--parse-workers', type=int, default=int(os.environ.get('PARSE_WORKERS', '0')), help='The number of worker processes that parse the pages.')
+
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_arguments()))
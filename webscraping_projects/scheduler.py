@@ -0,0 +1,146 @@
+"""
+    Functions that schedule the scrapers.
+
+    This module only imports the cron machinery. Every run is a short-lived worker process that imports
+    the HTTP client, the parsers and the sinks, and gives all their memory back when it exits, so the
+    scheduler waiting for the next run stays small. The scripts of the scrapers hand over to "schedule"
+    before they import anything else, unless they are started with "--once" to run the scraper.
+
+    A trigger that fires while the previous run of its job is still running follows the overlap policy:
+    "skip" drops it, "queue" runs it after the previous run, and "coalesce" queues it only if no other
+    trigger is already waiting, so any number of triggers during a slow run turns into a single catch-up run.
+"""
+
+from datetime import datetime, timedelta
+from functools import partial
+import aiocron
+import asyncio
+import sys
+import os
+
+policies: tuple = ('skip', 'queue', 'coalesce')
+overlap_policy = os.environ.get('OVERLAP_POLICY', 'skip')
+
+class Job:
+
+    """
+        Class that runs a scheduled job, applying the overlap policy to the triggers that fire while it runs.
+
+        Attributes
+        ----------
+        function: object
+            The coroutine function of the job.
+
+        name: str
+            The name of the job, used in the messages.
+
+        policy: str
+            The overlap policy, "skip", "queue" or "coalesce".
+
+        lock: asyncio.Lock
+            The lock held by the running trigger of the job.
+
+        waiting: int
+            The number of triggers waiting for the running one to finish.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        __call__()
+            Function that runs the job for a trigger, unless the overlap policy drops it.
+    """
+
+    def __init__(
+        self: object,
+        function: object,
+        name: str,
+        policy: str = 'skip'
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        if policy not in policies:
+            raise Exception(
+                f'The overlap policy {policy} is not supported. Use one of: {", ".join(policies)}.'
+            )
+
+        self.function: object = function
+        self.name: str = name
+        self.policy: str = policy
+
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.waiting: int = 0
+
+    async def __call__(self: object) -> None:
+
+        """
+            Function that runs the job for a trigger, unless the overlap policy drops it.
+        """
+
+        if self.lock.locked():
+            if self.policy == 'skip':
+                print(f'Skipping a trigger of {self.name}, because the previous run is still in progress.')
+                return
+
+            if self.policy == 'coalesce' and self.waiting:
+                print(f'Skipping a trigger of {self.name}, because a run is already waiting for the previous one.')
+                return
+
+            print(f'A trigger of {self.name} is waiting for the previous run to finish.')
+
+        self.waiting += 1
+        async with self.lock:
+            self.waiting -= 1
+            await self.function()
+
+async def run_worker(*arguments) -> int:
+
+    """
+        Function that runs "python *arguments" in a worker process and waits for it to finish.
+
+        Returns the exit code of the worker.
+    """
+
+    process = await asyncio.create_subprocess_exec(sys.executable, *arguments)
+    return await process.wait()
+
+def schedule(*arguments, cron: str = '0 8 * * *', offset: int = 0, policy: str = overlap_policy) -> None:
+
+    """
+        Function that runs "python *arguments" in a worker process once, a minute after the script
+        starts, and then with the cron expression.
+
+        The "offset" adds that many minutes to the first run, and "policy" is the overlap policy of the runs.
+    """
+
+    job = Job(partial(run_worker, *arguments), os.path.basename(arguments[0]), policy)
+
+    additional_minutes = 1 + offset
+    if datetime.now().second >= 50:
+        additional_minutes += 1
+    initial_cron = (datetime.now() + timedelta(minutes=additional_minutes)).strftime('%M %H * * *')
+    print(f'This script will start at {datetime.strptime(initial_cron, "%M %H * * *").strftime("%H:%M")}.')
+
+    @aiocron.crontab(initial_cron, start=True)
+    async def start_initial():
+
+        start_initial.stop()
+
+        await job()
+
+    @aiocron.crontab(cron, start=True)
+    async def start_recursively():
+
+        await job()
+
+    loop = asyncio.get_event_loop()
+
+    try:
+        loop.run_forever()
+
+    except Exception:
+        loop.close()
@@ -0,0 +1,564 @@
+from time import perf_counter
+from sys import intern
+import json
+import csv
+import os
+
+class Columns:
+
+    """
+        Class that keeps rows column by column, as one list of values per column, instead of one dict per row.
+
+        The column names are stored once instead of in every row, and the strings of the "categorical"
+        columns, such as the category of every book, are interned so all the rows share a single copy.
+        The columns are converted to a DataFrame or an Arrow table directly, without building a dict per row.
+
+        Attributes
+        ----------
+        categorical: tuple
+            The columns whose strings repeat across rows and are interned.
+
+        data: dict
+            A dict that stores, per column, the list of its values.
+
+        length: int
+            The number of rows.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        __len__()
+            Function that returns the number of rows.
+
+        append()
+            Function that adds a row.
+
+        append_rows()
+            Function that adds several rows, filling with None the columns a row does not have.
+
+        add_constant()
+            Function that adds a column with the same value in every row.
+
+        extend()
+            Function that adds the rows of other columns.
+
+        rows()
+            Function that yields the rows as dicts, for the writers that need them.
+    """
+
+    def __init__(self: object, categorical: tuple = ()) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.categorical: tuple = categorical
+
+        self.data: dict = {}
+        self.length: int = 0
+
+    def __len__(self: object) -> int:
+
+        """
+            Function that returns the number of rows.
+        """
+
+        return self.length
+
+    def append(self: object, row: dict) -> None:
+
+        """
+            Function that adds a row.
+        """
+
+        self.append_rows([row])
+
+    def append_rows(self: object, rows: list) -> None:
+
+        """
+            Function that adds several rows, filling with None the columns a row does not have.
+        """
+
+        data = self.data
+        for row in rows:
+            if row.keys() != data.keys():
+                for column in row.keys() - data.keys():
+                    data[column] = [None] * self.length
+
+        for column, values in data.items():
+            if column in self.categorical:
+                values.extend([intern(value) if type(value) is str else value for value in (row.get(column) for row in rows)])
+            else:
+                values.extend([row.get(column) for row in rows])
+
+        self.length += len(rows)
+
+    def add_constant(self: object, column: str, value: object) -> None:
+
+        """
+            Function that adds a column with the same value in every row.
+        """
+
+        self.data[column] = [value] * self.length
+
+    def extend(self: object, columns: object) -> None:
+
+        """
+            Function that adds the rows of other columns.
+        """
+
+        for column in columns.data.keys() - self.data.keys():
+            self.data[column] = [None] * self.length
+
+        for column, values in self.data.items():
+            values.extend(columns.data.get(column) or [None] * columns.length)
+
+        self.length += columns.length
+
+    def rows(self: object) -> object:
+
+        """
+            Function that yields the rows as dicts, for the writers that need them.
+        """
+
+        names = list(self.data)
+        for values in zip(*self.data.values()):
+            yield dict(zip(names, values))
+
+class Sink:
+
+    """
+        Base class of the output sinks that receive the rows while they are scraped.
+
+        The rows are kept in a buffer, column by column, and flushed to the file in batches of "batch_size"
+        rows, so the memory used does not grow with the number of rows scraped.
+
+        Attributes
+        ----------
+        path: str
+            The path of the output file, without extension.
+
+        batch_size: int
+            The number of rows buffered before they are flushed to the file.
+
+        constants: dict
+            A dict of columns added to every row, such as "created_at".
+
+        categorical: tuple
+            The columns whose strings repeat across rows, kept once in memory.
+
+        buffer: Columns
+            The columns of the rows not flushed yet.
+
+        rows: int
+            The number of rows written.
+
+        write_time: float
+            The time, in seconds, spent writing the rows to the file.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        write()
+            Function that adds a row to the sink.
+
+        write_many()
+            Function that adds several rows to the sink.
+
+        flush()
+            Function that writes the buffered rows to the file.
+
+        write_batch()
+            Function implemented by each sink to write a batch of rows to the file.
+
+        close()
+            Function that flushes the remaining rows and closes the file.
+
+        read()
+            Function implemented by each sink to read the written file into a DataFrame.
+
+        export_excel()
+            Function that exports the written file to an excel report.
+    """
+
+    extension: str = ''
+
+    def __init__(
+        self: object,
+        path: str,
+        batch_size: int = 1000,
+        constants: dict | None = None,
+        categorical: tuple = ()
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.path: str = path + self.extension
+        self.batch_size: int = batch_size
+        self.constants: dict = constants or {}
+        self.categorical: tuple = categorical
+
+        self.buffer: Columns = Columns(categorical)
+        self.rows: int = 0
+        self.write_time: float = 0.0
+
+    def __enter__(self: object) -> object:
+
+        return self
+
+    def __exit__(self: object, *exc_info) -> None:
+
+        self.close()
+
+    def write(self: object, row: dict) -> None:
+
+        """
+            Function that adds a row to the sink.
+        """
+
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self: object, rows: list) -> None:
+
+        """
+            Function that adds several rows to the sink.
+        """
+
+        self.buffer.append_rows(rows if isinstance(rows, list) else list(rows))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self: object) -> None:
+
+        """
+            Function that writes the buffered rows to the file.
+
+            The buffer is emptied before the rows are written, so a batch that fails to be written raises once,
+            and is not written again when the sink is closed.
+        """
+
+        if self.buffer:
+            started_at = perf_counter()
+            buffer, self.buffer = self.buffer, Columns(self.categorical)
+            for column, value in self.constants.items():
+                buffer.add_constant(column, value)
+            self.write_batch(buffer)
+            self.write_time += perf_counter() - started_at
+
+            self.rows += len(buffer)
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function implemented by each sink to write a batch of rows to the file.
+        """
+
+        raise NotImplementedError
+
+    def close(self: object) -> None:
+
+        """
+            Function that flushes the remaining rows and closes the file.
+        """
+
+        self.flush()
+
+    def read(self: object) -> object:
+
+        """
+            Function implemented by each sink to read the written file into a DataFrame.
+        """
+
+        raise NotImplementedError
+
+    def export_excel(self: object, path: str, sheet_name: str) -> None:
+
+        """
+            Function that exports the written file to an excel report.
+        """
+
+        import pandas as pd
+
+        with pd.ExcelWriter(path) as writer:
+            self.read().to_excel(writer, index=False, sheet_name=sheet_name)
+
+class ParquetSink(Sink):
+
+    """
+        Class that writes the rows to a Parquet file, one row group per batch.
+
+        Every batch is written to a part file of its own, with the schema of its rows, and the parts are joined
+        in the Parquet file when it is closed, with the schema of all of them. So a column that is empty in the
+        first batches, or that only appears in a later one, keeps the type of its values.
+    """
+
+    extension: str = '.parquet'
+
+    def __init__(self: object, *args, **kwargs) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.parts: list = []
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function that writes a batch of rows to a part file of the Parquet file.
+
+            The columns are converted to an Arrow table as they are, without building a dict per row.
+        """
+
+        try:
+            import pyarrow.parquet as pq
+            import pyarrow as pa
+
+        except ImportError:
+            raise Exception(
+                'The "pyarrow" package is required to write Parquet reports. Use the "csv" or "jsonl" format instead.'
+            )
+
+        path = os.path.join(os.path.dirname(self.path), f'.{os.path.basename(self.path)}.{len(self.parts)}.part')
+        pq.write_table(pa.Table.from_pydict(columns.data), path)
+        self.parts.append(path)
+
+    def close(self: object) -> None:
+
+        """
+            Function that flushes the remaining rows and joins the part files in the Parquet file.
+
+            The schemas of the parts are unified, an empty column taking the type of its values in the other
+            parts, and every part is read and written in turn, with the columns it does not have left empty.
+        """
+
+        super().close()
+        if not self.parts:
+            return
+
+        import pyarrow.parquet as pq
+        import pyarrow as pa
+
+        schema = pa.unify_schemas([pq.read_schema(path) for path in self.parts], promote_options='permissive')
+        with pq.ParquetWriter(self.path, schema) as writer:
+            for path in self.parts:
+                table = pq.read_table(path)
+                writer.write_table(
+                    pa.table(
+                        [
+                            table.column(field.name).cast(field.type) if field.name in table.column_names else pa.nulls(len(table), field.type)
+                            for field in schema
+                        ],
+                        schema=schema
+                    )
+                )
+                os.remove(path)
+
+        self.parts = []
+
+    def read(self: object) -> object:
+
+        """
+            Function that reads the Parquet file into a DataFrame.
+        """
+
+        import pandas as pd
+
+        return pd.read_parquet(self.path)
+
+class CsvSink(Sink):
+
+    """
+        Class that writes the rows to a CSV file.
+
+        The columns of the file are the columns of every batch written. A column that only appears in a later
+        batch, such as a detail missing from the first rows, is added to the header, and the rows already written
+        are rewritten with it empty, so no column is dropped.
+    """
+
+    extension: str = '.csv'
+
+    def __init__(self: object, *args, **kwargs) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.file: object = None
+        self.writer: csv.DictWriter | None = None
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function that writes a batch of rows to the CSV file.
+        """
+
+        if self.writer is None:
+            self.file = open(self.path, 'w', newline='', encoding='utf-8')
+            self.writer = csv.DictWriter(self.file, fieldnames=list(columns.data))
+            self.writer.writeheader()
+
+        elif any(column not in self.writer.fieldnames for column in columns.data):
+            self.extend([*self.writer.fieldnames, *(column for column in columns.data if column not in self.writer.fieldnames)])
+
+        self.writer.writerows(columns.rows())
+
+    def extend(self: object, fieldnames: list) -> None:
+
+        """
+            Function that rewrites the CSV file with the given columns, the new ones empty in the rows already written.
+        """
+
+        self.file.close()
+
+        path = os.path.join(os.path.dirname(self.path), f'.{os.path.basename(self.path)}.extended')
+        with open(self.path, newline='', encoding='utf-8') as source, open(path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.DictWriter(target, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(csv.DictReader(source))
+
+        os.replace(path, self.path)
+
+        self.file = open(self.path, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames)
+
+    def close(self: object) -> None:
+
+        """
+            Function that flushes the remaining rows and closes the file.
+        """
+
+        super().close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+    def read(self: object) -> object:
+
+        """
+            Function that reads the CSV file into a DataFrame.
+        """
+
+        import pandas as pd
+
+        return pd.read_csv(self.path)
+
+class JsonlSink(Sink):
+
+    """
+        Class that writes the rows to a JSON Lines file, one JSON object per line.
+    """
+
+    extension: str = '.jsonl'
+
+    def __init__(self: object, *args, **kwargs) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.file: object = None
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function that writes a batch of rows to the JSON Lines file.
+        """
+
+        if self.file is None:
+            self.file = open(self.path, 'w', encoding='utf-8')
+
+        self.file.writelines(json.dumps(row, ensure_ascii=False, default=str) + '\n' for row in columns.rows())
+
+    def close(self: object) -> None:
+
+        """
+            Function that flushes the remaining rows and closes the file.
+        """
+
+        super().close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read(self: object) -> object:
+
+        """
+            Function that reads the JSON Lines file into a DataFrame.
+        """
+
+        import pandas as pd
+
+        return pd.read_json(self.path, lines=True)
+
+class MemorySink(Sink):
+
+    """
+        Class that keeps the rows in memory, used when a scraper runs without an output file.
+    """
+
+    def __init__(self: object, *args, **kwargs) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        super().__init__('', *args, **kwargs)
+
+        self.data: Columns = Columns(self.categorical)
+
+    def write_batch(self: object, columns: Columns) -> None:
+
+        """
+            Function that keeps a batch of rows in memory.
+        """
+
+        self.data.extend(columns)
+
+    def read(self: object) -> object:
+
+        """
+            Function that returns the rows kept in memory as a DataFrame.
+        """
+
+        import pandas as pd
+
+        self.flush()
+        return pd.DataFrame(self.data.data)
+
+sinks: dict = {
+    'parquet': ParquetSink,
+    'csv': CsvSink,
+    'jsonl': JsonlSink
+}
+
+def open_sink(path: str, report_format: str = 'parquet', **kwargs) -> Sink:
+
+    """
+        Function that opens the output sink of the given format.
+
+        The "path" is the path of the output file, without extension. The directory is created if needed.
+    """
+
+    if report_format not in sinks:
+        raise Exception(
+            f'The report format {report_format} is not supported. Use one of: {", ".join(sinks)}.'
+        )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return sinks[report_format](path, **kwargs)
@@ -0,0 +1,447 @@
+"""
+    The transports of the HTTP client and the decompression of the bodies they receive.
+
+    The client asks for the bodies compressed with every encoding it can decode: gzip and deflate always, and
+    brotli and zstd when the optional "brotli" and "zstandard" packages are installed. The bodies are received
+    as they travel on the wire and decompressed by the client itself, so both their compressed and decompressed
+    sizes are known. The default transport is aiohttp, over HTTP/1.1 with keep-alive connections. With "http2",
+    httpx, with the optional "h2" package, is used instead, multiplexing the requests to a host over one connection.
+    The optional packages are listed in "requirements-optional.txt".
+"""
+
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+import aiohttp
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def accept_encoding() -> str:
+
+    """
+        Function that returns the "Accept-Encoding" header of the encodings that can be decoded, the smallest first.
+    """
+
+    encodings = (('zstd', zstandard is not None), ('br', brotli is not None), ('gzip', True), ('deflate', True))
+    return ', '.join(encoding for encoding, available in encodings if available)
+
+def connection_trace(on_connection: object) -> aiohttp.TraceConfig:
+
+    """
+        Function that returns the trace of an aiohttp session that reports, for every request, its host and
+        whether it reused a keep-alive connection or opened a new one, to "on_connection".
+    """
+
+    async def on_request_start(session: object, context: object, params: object) -> None:
+
+        context.host = urlsplit(str(params.url)).netloc
+
+    async def on_connection_create_end(session: object, context: object, params: object) -> None:
+
+        on_connection(context.host, False)
+
+    async def on_connection_reuseconn(session: object, context: object, params: object) -> None:
+
+        on_connection(context.host, True)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+
+    return trace
+
+class Decompressor:
+
+    """
+        Class that decompresses a body while it is received, counting its compressed and decompressed bytes.
+
+        Attributes
+        ----------
+        encoding: str
+            The "Content-Encoding" of the body, "identity" when it is not compressed.
+
+        decompressor: object | None
+            The decompressor of the encoding, or None when the body is not compressed.
+
+        compressed: int
+            The number of bytes received.
+
+        decompressed: int
+            The number of bytes decompressed.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        decompress()
+            Function that decompresses a chunk of the body.
+
+        flush()
+            Function that returns what is left of the body once it is all received.
+    """
+
+    def __init__(
+        self: object,
+        encoding: str | None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.encoding: str = (encoding or 'identity').strip().lower()
+
+        if self.encoding in ('gzip', 'x-gzip'):
+            self.decompressor: object | None = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == 'deflate':
+            self.decompressor = zlib.decompressobj()
+        elif self.encoding == 'br' and brotli is not None:
+            self.decompressor = brotli.Decompressor()
+        elif self.encoding == 'zstd' and zstandard is not None:
+            self.decompressor = zstandard.ZstdDecompressor().decompressobj()
+        elif self.encoding == 'identity':
+            self.decompressor = None
+        else:
+            raise Exception(
+                f'The content encoding {self.encoding} is not supported.'
+            )
+
+        self.compressed: int = 0
+        self.decompressed: int = 0
+
+    def decompress(self: object, chunk: bytes) -> bytes:
+
+        """
+            Function that decompresses a chunk of the body.
+        """
+
+        self.compressed += len(chunk)
+        if self.decompressor is None:
+            content = chunk
+        elif self.encoding == 'br':
+            content = self.decompressor.process(chunk)
+        else:
+            content = self.decompressor.decompress(chunk)
+
+        self.decompressed += len(content)
+        return content
+
+    def flush(self: object) -> bytes:
+
+        """
+            Function that returns what is left of the body once it is all received.
+        """
+
+        content = self.decompressor.flush() if self.decompressor is not None and self.encoding != 'br' else b''
+        self.decompressed += len(content)
+        return content
+
+class DecompressedStream:
+
+    """
+        Class that passes the body stream of a response to its decoder, decompressed while it is read.
+
+        Attributes
+        ----------
+        stream: object
+            The body stream of the response, as received.
+
+        decompressor: Decompressor
+            The decompressor of the body.
+
+        finished: bool
+            Whether the whole body was read.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        read()
+            Function that reads up to about "n" bytes of the body, or all of it.
+
+        iter_chunked()
+            Function that yields the body in chunks of up to about "n" bytes.
+    """
+
+    def __init__(
+        self: object,
+        stream: object,
+        decompressor: Decompressor
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.stream: object = stream
+        self.decompressor: Decompressor = decompressor
+        self.finished: bool = False
+
+    @property
+    def total_bytes(self: object) -> int:
+
+        return self.decompressor.decompressed
+
+    async def read(self: object, n: int = -1) -> bytes:
+
+        """
+            Function that reads up to about "n" bytes of the body, or all of it.
+
+            The chunk read is decompressed at once, so it may be larger than "n". Unless "n" is 0, it is only empty at the end of the body.
+        """
+
+        if self.finished or n == 0:
+            return b''
+
+        if n < 0:
+            self.finished = True
+            return self.decompressor.decompress(await self.stream.read()) + self.decompressor.flush()
+
+        content = b''
+        while not content and not self.finished:
+            chunk = await self.stream.read(n)
+            if chunk:
+                content = self.decompressor.decompress(chunk)
+            else:
+                content = self.decompressor.flush()
+                self.finished = True
+
+        return content
+
+    async def iter_chunked(self: object, n: int) -> object:
+
+        """
+            Function that yields the body in chunks of up to about "n" bytes.
+        """
+
+        while chunk := await self.read(n):
+            yield chunk
+
+class Http2Stream:
+
+    """
+        Class that reads the body of an httpx response as it is received, like the body stream of aiohttp.
+
+        Attributes
+        ----------
+        chunks: object
+            The iterator of the chunks of the body.
+
+        buffer: bytes
+            The part of the last chunk not read yet.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        read()
+            Function that reads up to "n" bytes of the body, or all of it.
+
+        iter_chunked()
+            Function that yields the body in chunks of up to "n" bytes.
+    """
+
+    def __init__(
+        self: object,
+        response: object
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.chunks: object = response.aiter_raw()
+        self.buffer: bytes = b''
+
+    async def read(self: object, n: int = -1) -> bytes:
+
+        """
+            Function that reads up to "n" bytes of the body, or all of it.
+        """
+
+        if n < 0:
+            content = self.buffer + b''.join([chunk async for chunk in self.chunks])
+            self.buffer = b''
+            return content
+
+        if not self.buffer:
+            self.buffer = await anext(self.chunks, b'')
+
+        content, self.buffer = self.buffer[:n], self.buffer[n:]
+        return content
+
+    async def iter_chunked(self: object, n: int) -> object:
+
+        """
+            Function that yields the body in chunks of up to "n" bytes.
+        """
+
+        while chunk := await self.read(n):
+            yield chunk
+
+class Http2Response:
+
+    """
+        Class that holds an httpx response, with the attributes of an aiohttp response read by the client.
+
+        Attributes
+        ----------
+        status: int
+            The status of the response.
+
+        headers: object
+            The headers of the response.
+
+        content: Http2Stream
+            The body stream of the response, as received.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        read()
+            Function that reads the whole body, as received.
+    """
+
+    def __init__(
+        self: object,
+        response: object
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        self.status: int = response.status_code
+        self.headers: object = response.headers
+        self.content: Http2Stream = Http2Stream(response)
+
+    async def read(self: object) -> bytes:
+
+        """
+            Function that reads the whole body, as received.
+        """
+
+        return await self.content.read()
+
+class Http2Session:
+
+    """
+        Class that sends the requests over HTTP/2 with httpx, with the interface of the aiohttp session used by the client.
+
+        The requests to the same host are multiplexed over a single connection, so a host costs one handshake.
+        Timeouts and transport errors are raised as "asyncio.TimeoutError" and "ConnectionError", so the client
+        handles them like the ones of aiohttp.
+
+        Attributes
+        ----------
+        client: httpx.AsyncClient
+            The httpx client that holds the connections.
+
+        on_connection: object | None
+            The function told, for every request, its host and whether it reused a connection.
+
+        Methods
+        -------
+        __init__()
+            Constructor that initializes the necessary variables.
+
+        request()
+            Function that sends a request and yields its response while its body is read.
+
+        close()
+            Function that closes the connections.
+    """
+
+    def __init__(
+        self: object,
+        concurrency: int,
+        timeout: int,
+        headers: dict,
+        on_connection: object | None = None
+    ) -> None:
+
+        """
+            Constructor that initializes the necessary variables.
+        """
+
+        try:
+            import httpx
+
+            self.client: object = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency, keepalive_expiry=30),
+                timeout=timeout,
+                headers=headers,
+                follow_redirects=True
+            )
+
+        except ImportError:
+            raise Exception(
+                'The HTTP/2 transport needs the "httpx" and "h2" packages. Install them with "pip install -r requirements-optional.txt".'
+            )
+
+        self.on_connection: object | None = on_connection
+
+    @asynccontextmanager
+    async def request(self: object, method: str, url: str, **kwargs) -> object:
+
+        """
+            Function that sends a request and yields its response while its body is read.
+
+            The connection of the request is traced, so a request that opened a connection is told apart from
+            one that was multiplexed over, or reused, an open one.
+        """
+
+        import httpx
+
+        opened = []
+
+        async def trace(event: str, info: dict) -> None:
+
+            if event == 'connection.connect_tcp.complete':
+                opened.append(True)
+
+        try:
+            response = await self.client.send(
+                self.client.build_request(
+                    method, url,
+                    params=kwargs.get('params'), data=kwargs.get('data'), headers=kwargs.get('headers'),
+                    extensions={'trace': trace}
+                ),
+                stream=True
+            )
+            if self.on_connection is not None:
+                self.on_connection(urlsplit(url).netloc, not opened)
+
+            try:
+                yield Http2Response(response)
+            finally:
+                await response.aclose()
+
+        except httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+
+    async def close(self: object) -> None:
+
+        """
+            Function that closes the connections.
+        """
+
+        await self.client.aclose()